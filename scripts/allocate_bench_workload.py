@@ -5,15 +5,28 @@ Allocates isolation levels to benchmark workload files in parallel
 """
 
 import os
+import re
+import hashlib
 import sys
+import argparse
 import json
 import subprocess
-import csv
-import matplotlib.pyplot as plt
-import numpy as np
+import queue
+import threading
+from collections import Counter
+from itertools import repeat
 from pathlib import Path
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
 from datetime import datetime
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    from tqdm import tqdm
+except ImportError:
+    tqdm = None
 
 # Set UTF-8 encoding for Windows compatibility
 if sys.platform == 'win32':
@@ -26,12 +39,96 @@ YELLOW = '\033[1;33m'
 CYAN = '\033[0;36m'
 NC = '\033[0m'  # No Color
 
+# Mapping from JSON values to labels/colors
+# SER: Red, SI: Orange, PSI: Yellow, PC: Cyan, RA: Green
+LEVEL_MAP = {
+    'SERIALIZABLE': 'SER',
+    'SNAPSHOT_ISOLATION': 'SI',
+    'PARALLEL_SNAPSHOT_ISOLATION': 'PSI',
+    'PREFIX_CONSISTENCY': 'PC',
+    'CAUSAL_CONSISTENCY': 'CC',
+    'READ_ATOMIC': 'RA'
+}
+
+# Preferred order from reference image
+LEVELS = ['SER', 'SI', 'PSI', 'PC', 'RA']
+
+# Number of per-file status lines gathered before they are written out
+LOG_BATCH = 50
+
+# Status markers for the per-file lines, encoded once for sys.stdout.buffer
+OK_MARK = f" {GREEN}✓{NC}\n".encode('utf-8')
+FAIL_MARK = f" {RED}✗{NC}\n".encode('utf-8')
+SKIP_MARK = f" {CYAN}↻{NC}\n".encode('utf-8')
+
+# Allocated benchmark workload names: {bench}_..._{instance}.json
+WORKLOAD_PAT = re.compile(r'^(SmallBank|Courseware|TPCC)_.*_(\d+)\.json$')
+
+def write_lines(lines):
+    """
+    Write pre-encoded, newline-terminated status lines straight to the stdout buffer
+    """
+    # Anything print() still holds must come out first to keep the order
+    sys.stdout.flush()
+    buffer = getattr(sys.stdout, 'buffer', None)
+    if buffer is None:
+        sys.stdout.write(b''.join(lines).decode('utf-8'))
+    else:
+        buffer.write(b''.join(lines))
+        buffer.flush()
+    lines.clear()
+
 def get_project_dir():
     """Get the project root directory"""
     script_dir = Path(__file__).parent.absolute()
     project_dir = script_dir.parent
     return project_dir
 
+def resolve_java_cmd():
+    """Use system 'java' by default, or JAVA_HOME if set"""
+    java_home = os.environ.get('JAVA_HOME')
+    if java_home:
+        candidate = Path(java_home) / 'bin' / ('java.exe' if sys.platform == 'win32' else 'java')
+        if candidate.exists():
+            return str(candidate)
+    return 'java'
+
+def list_json(dirpath):
+    """List the *.json entries of a directory, sorted by name, in a single scandir pass"""
+    with os.scandir(dirpath) as it:
+        return sorted(
+            (entry for entry in it if entry.name.endswith('.json') and entry.is_file()),
+            key=lambda entry: entry.name
+        )
+
+def newest_mtime(root):
+    """
+    Return the newest modification time of any file under root (0 if empty)
+    """
+    newest = 0
+    stack = [root]
+    while stack:
+        with os.scandir(stack.pop()) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                else:
+                    newest = max(newest, entry.stat().st_mtime)
+    return newest
+
+def build_is_current(project_dir, classes_dir, stamp_file):
+    """
+    Check whether the last Maven build is newer than every Java source and pom.xml
+    The stamp file is touched after every successful build; cp.txt can't serve as
+    the stamp because build-classpath leaves it alone when the classpath is unchanged
+    """
+    if not classes_dir.exists() or not stamp_file.exists():
+        return False
+    stamp = stamp_file.stat().st_mtime
+    sources = max(newest_mtime(project_dir / 'src' / 'main' / 'java'),
+                  (project_dir / 'pom.xml').stat().st_mtime)
+    return stamp >= sources
+
 def get_classpath(classes_dir, project_dir):
     """
     Construct the Java classpath with all dependencies.
@@ -64,52 +161,230 @@ def get_classpath(classes_dir, project_dir):
     
     return classpath_parts
 
-def allocate_file(input_file, output_file, classpath, debug=False):
+def get_maven_classpath(classes_dir, classpath_file):
     """
-    Allocate a single workload file
-    Returns: (filename, success, error_message)
+    Build the Java classpath from the dependency list written by
+    `mvn dependency:build-classpath`. Returns None if Maven has not written it.
     """
-    filename = Path(input_file).name
-    
     try:
-        # Use system 'java' by default, or JAVA_HOME if set
-        java_cmd = 'java'
-        java_home = os.environ.get('JAVA_HOME')
-        if java_home:
-            candidate = Path(java_home) / 'bin' / ('java.exe' if sys.platform == 'win32' else 'java')
-            if candidate.exists():
-                java_cmd = str(candidate)
+        dependencies = classpath_file.read_text(encoding='utf-8').strip()
+    except OSError:
+        return None
+    
+    return os.pathsep.join(part for part in (str(classes_dir), dependencies) if part)
+
+class JavaWorkerPool:
+    """
+    Pool of long-lived algorithm.AllocatorServer JVMs.
+    Each worker handles one job at a time and idle workers wait
+    in a queue, so JVM startup is paid once per worker instead of once per file.
+    """
+    
+    def __init__(self, java_cmd, classpath, size, timeout=30, debug=False):
+        self.java_cmd = java_cmd
+        self.classpath = classpath
+        self.timeout = timeout
+        self.debug = debug
+        self._idle = queue.Queue()
+        self._workers = []
+        self._lock = threading.Lock()
         
+        try:
+            for _ in range(size):
+                self._idle.put(self._spawn())
+        except Exception:
+            self.close()
+            raise
+    
+    def _spawn(self):
         cmd = [
-            java_cmd,
-            '-cp', classpath,
-            'algorithm.Allocator',
-            'allocate',
-            str(input_file),
-            str(output_file)
+            self.java_cmd,
+            '-cp', self.classpath,
+            'algorithm.AllocatorServer'
         ]
         
-        if debug:
+        if self.debug:
             print(f"\nDebug - Command: {' '.join(cmd)}")
-            print(f"Debug - Classpath length: {len(classpath)}")
+            print(f"Debug - Classpath length: {len(self.classpath)}")
         
-        result = subprocess.run(
+        proc = subprocess.Popen(
             cmd,
-            capture_output=True,
-            encoding='utf-8',
-            timeout=30
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            # Errors come back on the ERR reply line; stderr is only shown when debugging
+            stderr=None if self.debug else subprocess.DEVNULL
         )
+        with self._lock:
+            self._workers.append(proc)
+        return proc
+    
+    def allocate(self, input_file, output_file):
+        """
+        Run one allocation job on the next idle worker
+        Returns: (success, error_message)
+        """
+        proc = self._idle.get()
+        finished = False
+        killed = False
+        job_lock = threading.Lock()
         
-        if result.returncode == 0:
-            return (filename, True, None)
-        else:
-            error_msg = result.stderr
-            if debug:
-                print(f"Debug - Error output:\n{error_msg}")
-            return (filename, False, error_msg[:200])
+        def expire():
+            nonlocal killed
+            # cancel() does not stop a callback that is already running, so the
+            # kill is skipped once the job is over and the worker may be requeued
+            with job_lock:
+                if not finished:
+                    killed = True
+                    proc.kill()
+        
+        # A hung allocation is killed, which makes readline() return b''. The
+        # timer starts before the request is written, so a worker that stopped
+        # reading its stdin is timed out too.
+        timer = threading.Timer(self.timeout, expire)
+        timer.start()
+        try:
+            proc.stdin.write(f"{input_file}\t{output_file}\n".encode('utf-8'))
+            proc.stdin.flush()
+            reply = proc.stdout.readline()
+        except OSError:
+            reply = b''
+        finally:
+            timer.cancel()
+            with job_lock:
+                finished = True
+        
+        if killed or not reply:
+            # Replace the dead worker so later jobs still have somewhere to run
+            proc.kill()
+            proc.wait()
+            try:
+                self._idle.put(self._spawn())
+            except OSError:
+                self._idle.put(proc)  # the next job retries the respawn
+            return (False, f"Java worker exited (timeout >{self.timeout}s or crash)")
+        
+        self._idle.put(proc)
+        # Replies stay bytes; only error details are ever decoded
+        if reply.startswith(b'OK'):
+            return (True, None)
+        detail = reply.rstrip().partition(b' ')[2]
+        return (False, detail[:200].decode('utf-8', errors='replace'))
+    
+    def close(self):
+        """Close every worker's stdin and wait for the JVMs to exit"""
+        with self._lock:
+            workers = list(self._workers)
+        for proc in workers:
+            try:
+                proc.stdin.close()
+            except OSError:
+                pass
+        for proc in workers:
+            proc.wait()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+def allocate_file(input_file, output_file, pool):
+    """
+    Allocate a single workload file on one of the pool's Java workers
+    Returns: (filename, success, error_message)
+    """
+    filename = Path(input_file).name
+    
+    try:
+        success, error = pool.allocate(input_file, output_file)
+        return (filename, success, error)
     except Exception as e:
         return (filename, False, str(e))
 
+def count_levels(json_path):
+    """
+    Compute the isolation level distribution of one allocated workload file
+    Returns: (percentages, error_message)
+    """
+    try:
+        with open(json_path, 'rb') as f:
+            raw = f.read()
+        # orjson decodes straight from bytes; json.loads accepts UTF-8 bytes too
+        data = orjson.loads(raw) if orjson is not None else json.loads(raw)
+        templates = data.get('templates', [])
+        total = len(templates)
+        
+        # Count the raw level strings in C (map + Counter never enter bytecode),
+        # then fold the handful of distinct values into the chart levels
+        raw_counts = Counter(map(dict.get, templates, repeat('isolationLevel')))
+        
+        counts = {lvl: 0 for lvl in LEVELS}
+        # Track CC separately if it exists but map it to RA for the 5-level chart if needed
+        # or just ignore it if it doesn't appear.
+        for lvl_raw, n in raw_counts.items():
+            lvl_mapped = LEVEL_MAP.get(lvl_raw, 'RA')
+            if lvl_mapped == 'CC': lvl_mapped = 'RA' # Map CC to RA for simplicity in the 5-color chart
+            
+            if lvl_mapped in counts:
+                counts[lvl_mapped] += n
+        
+        # Convert to percentages
+        if total > 0:
+            percentages = {lvl: (counts[lvl] / total * 100) for lvl in LEVELS}
+        else:
+            percentages = {lvl: 0 for lvl in LEVELS}
+        
+        return (percentages, None)
+    except Exception as e:
+        return (None, str(e))
+
+def distribution_cache_key(matched):
+    """
+    Fingerprint the set of allocated files by name and modification time
+    """
+    digest = hashlib.sha1()
+    for entry, _, _ in matched:
+        digest.update(f"{entry.path}\0{entry.stat().st_mtime_ns}\n".encode('utf-8'))
+    return digest.hexdigest()
+
+def load_distribution_cache(cache_file, key):
+    """
+    Load the per-instance distributions saved by save_distribution_cache
+    Returns: all_data, or None if the cache is missing or stale
+    """
+    import numpy as np
+    
+    try:
+        with np.load(cache_file, allow_pickle=False) as cache:
+            if str(cache['key']) != key:
+                return None
+            benches, instances, pct = cache['bench'], cache['instance'], cache['pct']
+    except (OSError, KeyError, ValueError):
+        return None
+    
+    all_data = {}
+    for bench, inst, row in zip(benches.tolist(), instances.tolist(), pct.tolist()):
+        all_data.setdefault(bench, {})[inst] = dict(zip(LEVELS, row))
+    return all_data
+
+def save_distribution_cache(cache_file, key, all_data):
+    """
+    Save all_data as flat arrays (one row per instance, one column per level)
+    """
+    import numpy as np
+    
+    rows = [(bench, inst, dist) for bench, insts in all_data.items() for inst, dist in insts.items()]
+    try:
+        np.savez_compressed(
+            cache_file,
+            key=np.array(key),
+            bench=np.array([bench for bench, _, _ in rows], dtype=str),
+            instance=np.array([inst for _, inst, _ in rows], dtype=np.int64),
+            pct=np.array([[dist[lvl] for lvl in LEVELS] for _, _, dist in rows], dtype=np.float64).reshape(-1, len(LEVELS))
+        )
+    except OSError as e:
+        print(f"{YELLOW}  Warning: Could not write distribution cache: {e}{NC}")
+
 def create_allocation_plots(allocated_dir):
     """
     Create visualization plots for the isolation level allocation results
@@ -117,77 +392,62 @@ def create_allocation_plots(allocated_dir):
     """
     print(f"\n{CYAN}Creating visualization plots for benchmarks...{NC}")
     
-    # Mapping from JSON values to labels/colors
-    # SER: Red, SI: Orange, PSI: Yellow, PC: Cyan, RA: Green
-    level_map = {
-        'SERIALIZABLE': 'SER',
-        'SNAPSHOT_ISOLATION': 'SI',
-        'PARALLEL_SNAPSHOT_ISOLATION': 'PSI',
-        'PREFIX_CONSISTENCY': 'PC',
-        'CAUSAL_CONSISTENCY': 'CC',
-        'READ_ATOMIC': 'RA'
-    }
-    
-    # Preferred order and colors from reference image
-    levels = ['SER', 'SI', 'PSI', 'PC', 'RA']
+    levels = LEVELS
     colors = ['red', 'orange', 'yellow', 'cyan', 'lime']
     
     # Data structure: benchmark -> instances -> level distributions
     all_data = {}
     
     # Read all allocated files
-    json_files = list(allocated_dir.glob('*.json'))
+    json_files = list_json(allocated_dir)
     if not json_files:
         print(f"{YELLOW}No allocated JSON files found in {allocated_dir}{NC}")
         return
     
-    print(f"Analyzing {len(json_files)} files for plotting...")
-    
+    # Filename example: SmallBank_100t_500k_1.json
+    # Files that don't follow the naming scheme are dropped before they are opened
+    matched = []
     for json_file in json_files:
-        filename = json_file.name
-        # Filename example: SmallBank_100t_500k_1.json
-        parts = filename.replace('.json', '').split('_')
-        if len(parts) < 1: continue
-        
-        bench_type = parts[0] # SmallBank, Courseware, or TPCC (case sensitive matching depends on filename)
+        m = WORKLOAD_PAT.match(json_file.name)
+        if not m:
+            continue
+        matched.append((json_file, m.group(1), int(m.group(2))))
+    
+    if not matched:
+        print(f"{YELLOW}No benchmark workload files found in {allocated_dir}{NC}")
+        return
+    
+    # Reuse the distributions from the last run if none of the files changed
+    cache_file = Path('data') / 'bench_allocation_cache.npz'
+    cache_key = distribution_cache_key(matched)
+    cached = load_distribution_cache(cache_file, cache_key)
+    
+    if cached is not None:
+        print(f"Using cached distributions for {len(matched)} files")
+        all_data = cached
+    else:
+        print(f"Analyzing {len(matched)} files for plotting...")
         
-        # Try to extract the instance number (the last part)
-        try:
-            instance_num = int(parts[-1])
-        except (ValueError, IndexError):
-            # Fallback if the last part is not a number
-            instance_num = filename
+        errors = 0
+        # Decoding is CPU-bound and independent per file, so it is spread over processes
+        max_workers = min(os.cpu_count() or 4, len(matched))
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            results = executor.map(count_levels, [entry.path for entry, _, _ in matched], chunksize=8)
             
-        if bench_type not in all_data:
-            all_data[bench_type] = {}
-        
-        try:
-            with open(json_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                templates = data.get('templates', [])
-                total = len(templates)
+            for (json_file, bench_type, instance_num), (percentages, error) in zip(matched, results):
+                if bench_type not in all_data:
+                    all_data[bench_type] = {}
                 
-                counts = {lvl: 0 for lvl in levels}
-                # Track CC separately if it exists but map it to RA for the 5-level chart if needed
-                # or just ignore it if it doesn't appear.
-                for t in templates:
-                    lvl_raw = t.get('isolationLevel')
-                    lvl_mapped = level_map.get(lvl_raw, 'RA')
-                    if lvl_mapped == 'CC': lvl_mapped = 'RA' # Map CC to RA for simplicity in the 5-color chart
-                    
-                    if lvl_mapped in counts:
-                        counts[lvl_mapped] += 1
+                if error is not None:
+                    print(f"{YELLOW}  Warning: Error reading {json_file.name}: {error}{NC}")
+                    errors += 1
+                    continue
                 
-                # Convert to percentages
-                if total > 0:
-                    percentages = {lvl: (counts[lvl] / total * 100) for lvl in levels}
-                else:
-                    percentages = {lvl: 0 for lvl in levels}
-                    
                 all_data[bench_type][instance_num] = percentages
-                
-        except Exception as e:
-            print(f"{YELLOW}  Warning: Error reading {filename}: {e}{NC}")
+        
+        # Only cache complete results so unreadable files are reported again next run
+        if errors == 0:
+            save_distribution_cache(cache_file, cache_key, all_data)
     
     # Define benchmarks and ensure they are sorted/selected correctly
     # Filenames use 'TPCC', 'SmallBank', 'Courseware'
@@ -199,6 +459,16 @@ def create_allocation_plots(allocated_dir):
         print(f"{YELLOW}No recognized benchmark data found. Available keys: {list(all_data.keys())}{NC}")
         return
 
+    # Plotting libraries are only needed from here on; importing them lazily keeps
+    # them out of the allocation path and out of the pool workers above
+    import csv
+    import matplotlib
+    # Only files are written, so skip interactive backend selection
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    from matplotlib.collections import PolyCollection
+    import numpy as np
+    
     # Start plotting - 1 row, N columns
     num_plots = len(benchmarks)
     fig, axes = plt.subplots(1, num_plots, figsize=(6 * num_plots, 5), sharey=True)
@@ -216,12 +486,26 @@ def create_allocation_plots(allocated_dir):
             sorted_instances = sorted(bench_results.keys())
             
         x = np.arange(len(sorted_instances))
-        bottom = np.zeros(len(sorted_instances))
+        
+        # (levels, instances) matrix of stacked segment tops and bottoms
+        y = np.array([[bench_results[inst][lvl] for inst in sorted_instances] for lvl in levels], dtype=float)
+        tops = np.cumsum(y, axis=0)
+        bottoms = tops - y
+        
+        # One PolyCollection per level instead of one Rectangle per bar segment;
+        # the rectangles match ax.bar(width=0.8)
+        left = np.broadcast_to(x - 0.4, tops.shape)
+        right = np.broadcast_to(x + 0.4, tops.shape)
+        verts = np.stack([
+            np.stack([left, bottoms], axis=-1),
+            np.stack([right, bottoms], axis=-1),
+            np.stack([right, tops], axis=-1),
+            np.stack([left, tops], axis=-1)
+        ], axis=2)
         
         for lvl_idx, lvl in enumerate(levels):
-            y = [bench_results[inst][lvl] for inst in sorted_instances]
-            ax.bar(x, y, bottom=bottom, label=lvl, color=colors[lvl_idx], width=0.8, edgecolor='none')
-            bottom += y
+            ax.add_collection(PolyCollection(verts[lvl_idx], facecolors=colors[lvl_idx], edgecolors='none', label=lvl))
+        ax.autoscale_view()
             
         ax.set_title(bench, y=-0.2, fontsize=14, fontweight='bold')
         
@@ -290,6 +574,24 @@ def create_allocation_plots(allocated_dir):
         print(f"{RED}Error saving CSV: {e}{NC}")
 
 def main():
+    parser = argparse.ArgumentParser(
+        description='Allocate isolation levels to benchmark workloads'
+    )
+    
+    parser.add_argument(
+        '--force',
+        action='store_true',
+        help='Re-allocate files whose output is already up to date'
+    )
+    
+    parser.add_argument(
+        '-v', '--verbose',
+        action='store_true',
+        help='Print a status line for every file instead of a progress bar'
+    )
+    
+    args = parser.parse_args()
+    
     project_dir = get_project_dir()
     os.chdir(project_dir)
     
@@ -297,6 +599,8 @@ def main():
     allocated_dir = project_dir / 'data' / 'allocated_bench_workload'
     build_dir = project_dir / 'target'
     classes_dir = build_dir / 'classes'
+    classpath_file = build_dir / 'cp.txt'
+    build_stamp = build_dir / '.build-stamp'
     
     print("=" * 42)
     print("Benchmark Workload Allocation (Fast Mode)")
@@ -309,24 +613,33 @@ def main():
         return 1
     
     # Recompile Java code
-    print(f"{CYAN}Recompiling Java code...{NC}")
     maven_available = False
-    try:
-        result = subprocess.run(
-            ['mvn', 'clean', 'compile', 'dependency:copy-dependencies'],
-            capture_output=True,
-            encoding='utf-8',
-            timeout=300
-        )
-        if result.returncode == 0:
-            maven_available = True
-            print(f"{GREEN}✓ Java code compiled successfully{NC}")
-        else:
-            print(f"{YELLOW}Warning: Maven compilation failed{NC}")
+    if build_is_current(project_dir, classes_dir, build_stamp):
+        maven_available = True
+        print(f"{GREEN}✓ Java code is up to date, skipping Maven{NC}")
+    else:
+        print(f"{CYAN}Recompiling Java code...{NC}")
+        try:
+            # No 'clean', so the incremental compiler only rebuilds what changed
+            result = subprocess.run(
+                ['mvn', '-B', '-q', '-T', '1C', 'compile',
+                 'dependency:copy-dependencies', 'dependency:build-classpath',
+                 f'-Dmdep.outputFile={classpath_file}',
+                 '-Dmaven.compiler.useIncrementalCompilation=true'],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                timeout=300
+            )
+            if result.returncode == 0:
+                maven_available = True
+                build_stamp.touch()
+                print(f"{GREEN}✓ Java code compiled successfully{NC}")
+            else:
+                print(f"{YELLOW}Warning: Maven compilation failed{NC}")
+                print(f"{YELLOW}Checking for existing compiled classes...{NC}")
+        except Exception as e:
+            print(f"{YELLOW}Warning: Failed to run Maven: {e}{NC}")
             print(f"{YELLOW}Checking for existing compiled classes...{NC}")
-    except Exception as e:
-        print(f"{YELLOW}Warning: Failed to run Maven: {e}{NC}")
-        print(f"{YELLOW}Checking for existing compiled classes...{NC}")
     
     print()
     
@@ -346,15 +659,19 @@ def main():
     # Create output directory
     allocated_dir.mkdir(parents=True, exist_ok=True)
     
-    # Build classpath
-    classpath_parts = get_classpath(classes_dir, project_dir)
-    if sys.platform.startswith('win'):
-        classpath = ';'.join(classpath_parts)
-    else:
-        classpath = ':'.join(classpath_parts)
+    # Build classpath, preferring the one Maven resolved during compilation
+    classpath = get_maven_classpath(classes_dir, classpath_file)
+    if classpath is None:
+        classpath_parts = get_classpath(classes_dir, project_dir)
+        if sys.platform.startswith('win'):
+            classpath = ';'.join(classpath_parts)
+        else:
+            classpath = ':'.join(classpath_parts)
+    
+    java_cmd = resolve_java_cmd()
     
     # Find all workload files
-    workload_files = sorted(bench_workload_dir.glob('*.json'))
+    workload_files = list_json(bench_workload_dir)
     total_files = len(workload_files)
     
     if total_files == 0:
@@ -368,33 +685,87 @@ def main():
     # Process files in parallel
     successful = 0
     failed = 0
+    skipped = 0
     failed_files = []
     
-    max_workers = 4  # Limit concurrent allocations
-    
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        futures = {}
+    # Outputs at least as new as both their input and the last successful build
+    # are up to date; one scandir of the output directory supplies every mtime
+    # needed for the comparison
+    allocated_mtimes = {}
+    build_mtime = build_stamp.stat().st_mtime if build_stamp.exists() else 0
+    if not args.force:
+        with os.scandir(allocated_dir) as it:
+            allocated_mtimes = {entry.name: entry.stat().st_mtime for entry in it if entry.is_file()}
+    
+    # Status lines are kept as bytes and written LOG_BATCH at a time, so the console
+    # is not hit (or the text encoder run) once per file
+    log_lines = []
+    
+    pending = []
+    for input_file in workload_files:
+        output_mtime = allocated_mtimes.get(input_file.name)
+        if output_mtime is not None and output_mtime >= max(input_file.stat().st_mtime, build_mtime):
+            skipped += 1
+            if args.verbose:
+                log_lines.append(f"[{skipped:2d}/{total_files}] {input_file.name:<30}".encode('utf-8') + SKIP_MARK)
+            continue
+        pending.append(input_file)
+    
+    if log_lines:
+        write_lines(log_lines)
+    elif skipped > 0:
+        print(f"{CYAN}↻ {skipped} files already up to date{NC}")
+    if skipped > 0 and not build_mtime:
+        # Without a build stamp there is no telling which allocator wrote the kept files
+        print(f"{YELLOW}Warning: no build stamp found; kept results may predate the current build "
+              f"(use --force to re-allocate){NC}")
+    
+    if pending:
+        # One JVM worker per core, but never more workers than files
+        max_workers = min(os.cpu_count() or 4, len(pending))
+        
+        try:
+            pool = JavaWorkerPool(java_cmd, classpath, size=max_workers)
+        except OSError as e:
+            print(f"{RED}Error: Failed to start Java workers: {e}{NC}")
+            return 1
         
-        for input_file in workload_files:
-            output_file = allocated_dir / input_file.name
-            future = executor.submit(
+        # Threads only orchestrate; the allocation work runs inside the JVM workers
+        with pool, ThreadPoolExecutor(max_workers=max_workers) as executor:
+            # map() hands results back in submission order without per-future
+            # completion callbacks; the pool argument is the same for every task
+            results = executor.map(
                 allocate_file,
-                input_file,
-                output_file,
-                classpath
+                [input_file.path for input_file in pending],
+                [allocated_dir / input_file.name for input_file in pending],
+                repeat(pool)
             )
-            futures[future] = input_file.name
-        
-        for i, future in enumerate(as_completed(futures), 1):
-            filename, success, error = future.result()
             
-            if success:
-                print(f"[{i:2d}/{total_files}] {filename:<30} {GREEN}✓{NC}")
-                successful += 1
-            else:
-                print(f"[{i:2d}/{total_files}] {filename:<30} {RED}✗{NC}")
-                failed += 1
-                failed_files.append(filename)
+            progress = None
+            if not args.verbose and tqdm is not None:
+                progress = tqdm(total=len(pending), unit='file', mininterval=0.25)
+            
+            for i, (filename, success, error) in enumerate(results, skipped + 1):
+                if success:
+                    successful += 1
+                    status = OK_MARK
+                else:
+                    failed += 1
+                    failed_files.append(filename)
+                    status = FAIL_MARK
+                
+                if progress is not None:
+                    progress.update()
+                elif args.verbose:
+                    log_lines.append(f"[{i:2d}/{total_files}] {filename:<30}".encode('utf-8') + status)
+                elif i % LOG_BATCH == 0 or i == total_files:
+                    log_lines.append(f"[{i:2d}/{total_files}] files processed\n".encode('utf-8'))
+                
+                if len(log_lines) >= LOG_BATCH or (log_lines and i == total_files):
+                    write_lines(log_lines)
+            
+            if progress is not None:
+                progress.close()
     
     print()
     print("=" * 42)
@@ -402,6 +773,8 @@ def main():
     print("=" * 42)
     print(f"Total files processed: {total_files}")
     print(f"Successful: {GREEN}{successful}{NC}")
+    if skipped > 0:
+        print(f"Up to date (skipped): {CYAN}{skipped}{NC}")
     
     if failed > 0:
         print(f"Failed: {RED}{failed}{NC}")
@@ -413,7 +786,8 @@ def main():
     else:
         print(f"{GREEN}All allocations completed successfully!{NC}")
         print()
-        allocated_count = len(list(allocated_dir.glob('*.json')))
+        with os.scandir(allocated_dir) as it:
+            allocated_count = sum(1 for entry in it if entry.name.endswith('.json'))
         print(f"Output directory: {allocated_dir}")
         print(f"{allocated_count} files allocated")
         
@@ -6,22 +6,22 @@ Records execution time for each file and outputs performance metrics to CSV
 
 import os
 import sys
+import functools
 import json
 import csv
 import subprocess
 import time
 import re
 import random
+import signal
+import asyncio
+import argparse
+import math
 from pathlib import Path
-from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
-from typing import Tuple, List, Dict, Optional
-import matplotlib.pyplot as plt
-import numpy as np
-try:
-    import pandas as pd
-except ImportError:
-    pd = None
+from operator import itemgetter
+from itertools import islice
+from typing import Tuple, List, Optional
 
 # Set UTF-8 encoding for Windows compatibility
 if sys.platform == 'win32':
@@ -34,29 +34,51 @@ YELLOW = '\033[1;33m'
 CYAN = '\033[0;36m'
 NC = '\033[0m'  # No Color
 
+# Resolution of saved plots; override with the PLOT_DPI environment variable
+DEFAULT_PLOT_DPI = 150
+
+# Columns of the raw per-file results CSV
+PERFORMANCE_FIELDS = ['filename', 'status', 'execution_time_seconds', 'error_message']
+
+# workload_{txns}t_{max_ops}o_{max_key}k_{read_only}r_{case_num}.json
+_WORKLOAD_RE = re.compile(r'workload_(\d+)t_(\d+)o_(\d+)k_(\d+)r_(\d+)\.json')
+
 def get_project_dir():
     """Get the project root directory"""
     script_dir = Path(__file__).parent.absolute()
     project_dir = script_dir.parent
     return project_dir
 
+def resolve_java_cmd():
+    """
+    Use system 'java' by default, or JAVA_HOME if set
+    Returns: the java executable to launch
+    """
+    java_home = os.environ.get('JAVA_HOME')
+    if java_home:
+        candidate = Path(java_home) / 'bin' / ('java.exe' if sys.platform == 'win32' else 'java')
+        if candidate.exists():
+            return str(candidate)
+    return 'java'
+
+@functools.lru_cache(maxsize=1)
 def get_classpath(classes_dir, project_dir):
     """
     Construct the Java classpath with all dependencies.
+    Returns: tuple of classpath entries (cached, so the filesystem is only checked once)
     """
     classpath_parts = [str(classes_dir)]
     
-    # Add target/dependency directory if it exists
+    # Add the jars in target/dependency by name, so the JVM doesn't have to
+    # expand a '*' entry on every launch
     dependency_dir = project_dir / 'target' / 'dependency'
     if dependency_dir.exists():
-        if sys.platform == 'win32':
-            classpath_parts.append(str(dependency_dir / '*'))
-        else:
-            # On non-Windows, we might need to expand the wildcard or use it as is
-            # Java handles the * wildcard in classpath
-            classpath_parts.append(str(dependency_dir / '*'))
+        classpath_parts.extend(sorted(str(jar) for jar in dependency_dir.glob('*.jar')))
+    
+    if len(classpath_parts) > 1:
+        return tuple(classpath_parts)
             
-    # Also try to find dependencies in Maven local repository as fallback
+    # Otherwise try to find dependencies in Maven local repository as fallback
     m2_repo = Path.home() / '.m2' / 'repository'
     if m2_repo.exists():
         required_deps = [
@@ -70,61 +92,217 @@ def get_classpath(classes_dir, project_dir):
             if dep_path.exists():
                 classpath_parts.append(str(dep_path))
     
-    return classpath_parts
+    return tuple(classpath_parts)
 
-def allocate_file(input_file, output_file, classpath, debug=False) -> Tuple[str, bool, Optional[str], float]:
+class JvmWorkerPool:
     """
-    Allocate a single workload file and record execution time
-    Returns: (filename, success, error_message, execution_time_seconds)
+    Pool of long-lived algorithm.AllocatorServer JVMs driven from asyncio.
+    Jobs are sent as one line per file, so JVM startup and JIT warmup are
+    paid once per worker instead of once per file. The idle queue also caps
+    how many jobs run at once.
     """
-    filename = Path(input_file).name
     
-    try:
-        start_time = time.time()
-        
-        # Use system 'java' by default, or JAVA_HOME if set
-        java_cmd = 'java'
-        java_home = os.environ.get('JAVA_HOME')
-        if java_home:
-            candidate = Path(java_home) / 'bin' / ('java.exe' if sys.platform == 'win32' else 'java')
-            if candidate.exists():
-                java_cmd = str(candidate)
+    def __init__(self, java_cmd, classpath, size, timeout=300, jvm_heap=None, debug=False):
+        self.java_cmd = java_cmd
+        self.classpath = classpath
+        self.jvm_heap = jvm_heap
+        self.size = size
+        self.timeout = timeout
+        self.debug = debug
+        self._idle = None
+        self._workers = []
+    
+    async def start(self):
+        self._idle = asyncio.Queue()
+        try:
+            for _ in range(self.size):
+                self._idle.put_nowait(await self._spawn())
+        except Exception:
+            await self.close()
+            raise
+    
+    async def _spawn(self):
+        cmd = [self.java_cmd]
+        if self.jvm_heap:
+            cmd.append(f'-Xmx{self.jvm_heap}')
+        cmd += ['-cp', self.classpath, 'algorithm.AllocatorServer']
         
-        cmd = [
-            java_cmd,
-            '-cp', classpath,
-            'algorithm.Allocator',
-            'allocate',
-            str(input_file),
-            str(output_file)
-        ]
-        
-        if debug:
+        if self.debug:
             print(f"\nDebug - Command: {' '.join(cmd)}")
-            print(f"Debug - Classpath length: {len(classpath)}")
+            print(f"Debug - Classpath length: {len(self.classpath)}")
         
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            encoding='utf-8',
-            timeout=300
-        )
+        # Each worker leads its own process group, so a timeout can take down
+        # any children and stray JVM threads along with it
+        if sys.platform == 'win32':
+            group_args = {'creationflags': subprocess.CREATE_NEW_PROCESS_GROUP}
+        else:
+            group_args = {'start_new_session': True}
         
+        proc = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=None if self.debug else asyncio.subprocess.DEVNULL,
+            **group_args
+        )
+        self._workers.append(proc)
+        return proc
+    
+    async def allocate(self, input_file, output_file):
+        """
+        Run one allocation job on the next idle worker
+        Returns: (success, error_message, execution_time_seconds)
+        """
+        proc = await self._idle.get()
+        start_time = time.time()
+        timed_out = False
+        try:
+            proc.stdin.write(f"{input_file}\t{output_file}\n".encode('utf-8'))
+            await proc.stdin.drain()
+            reply = await asyncio.wait_for(proc.stdout.readline(), timeout=self.timeout)
+        except asyncio.TimeoutError:
+            timed_out = True
+            reply = b''
+        except OSError:
+            reply = b''
         execution_time = time.time() - start_time
         
-        if result.returncode == 0:
-            return (filename, True, None, execution_time)
-        else:
-            error_msg = result.stderr.decode('utf-8', errors='ignore')
-            if debug:
-                print(f"Debug - Error output:\n{error_msg}")
-            return (filename, False, error_msg[:200], execution_time)
-    except subprocess.TimeoutExpired:
-        execution_time = time.time() - start_time
-        return (filename, False, "Timeout (>300s)", execution_time)
-    except Exception as e:
-        execution_time = time.time() - start_time
-        return (filename, False, str(e), execution_time)
+        if not reply:
+            # Replace the dead or hung worker so later jobs still have somewhere to run
+            self._kill(proc)
+            await proc.wait()
+            try:
+                self._idle.put_nowait(await self._spawn())
+            except OSError:
+                self._idle.put_nowait(proc)  # the next job retries the respawn
+            if timed_out:
+                return (False, f"Timeout (>{self.timeout}s)", execution_time)
+            return (False, "Java worker exited unexpectedly", execution_time)
+        
+        self._idle.put_nowait(proc)
+        reply = reply.decode('utf-8', errors='replace')
+        if reply.startswith('OK'):
+            return (True, None, execution_time)
+        if self.debug:
+            print(f"Debug - Error output:\n{reply}")
+        return (False, reply.rstrip().partition(' ')[2][:200], execution_time)
+    
+    @staticmethod
+    def _kill(proc):
+        """Kill a worker together with its process group"""
+        if proc.returncode is not None:
+            return
+        try:
+            if sys.platform == 'win32':
+                proc.kill()
+            else:
+                os.killpg(proc.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+    
+    async def close(self):
+        """Close every worker's stdin and wait for the JVMs to exit"""
+        for proc in self._workers:
+            try:
+                proc.stdin.close()
+            except OSError:
+                pass
+        for proc in self._workers:
+            await proc.wait()
+    
+    async def __aenter__(self):
+        await self.start()
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+class _BatchedStdout:
+    """
+    Collects progress lines and writes them to stdout in one call once
+    max_lines have piled up or max_delay seconds have passed
+    """
+    
+    def __init__(self, max_lines=16, max_delay=0.5):
+        self.max_lines = max_lines
+        self.max_delay = max_delay
+        self._lines = []
+        self._last_flush = time.monotonic()
+    
+    def log(self, line):
+        self._lines.append(line)
+        if len(self._lines) >= self.max_lines or time.monotonic() - self._last_flush >= self.max_delay:
+            self.flush()
+    
+    def flush(self):
+        if self._lines:
+            sys.stdout.write('\n'.join(self._lines) + '\n')
+            self._lines.clear()
+        sys.stdout.flush()
+        self._last_flush = time.monotonic()
+
+async def allocate_file(input_file, output_file, pool) -> Tuple[str, bool, Optional[str], float]:
+    """
+    Allocate a single workload file and record execution time
+    Returns: (filename, success, error_message, execution_time_seconds)
+    """
+    filename = os.path.basename(input_file)
+    success, error, execution_time = await pool.allocate(input_file, output_file)
+    return (filename, success, error, execution_time)
+
+async def allocate_all(workload_files, allocated_dir, java_cmd, classpath, max_workers, result_file, jvm_heap=None) -> List[Tuple[str, bool, Optional[str], float]]:
+    """
+    Allocate every workload file on a pool of JVM workers, printing each result as it completes
+    and appending it to the open result CSV straight away, so partial runs keep their rows
+    Returns: list of (filename, success, error_message, execution_time_seconds) in completion order
+    """
+    total_files = len(workload_files)
+    results = []
+    
+    writer = csv.DictWriter(result_file, fieldnames=PERFORMANCE_FIELDS)
+    writer.writeheader()
+    
+    out = _BatchedStdout()
+    
+    async with JvmWorkerPool(java_cmd, classpath, size=min(max_workers, total_files), jvm_heap=jvm_heap) as pool:
+        # Keep at most two jobs per worker in flight and top up as they finish,
+        # so the number of live tasks stays flat however many files there are
+        pending_files = iter(workload_files)
+        inflight = {
+            asyncio.create_task(allocate_file(input_file, allocated_dir / os.path.basename(input_file), pool))
+            for input_file in islice(pending_files, max_workers * 2)
+        }
+        
+        i = 0
+        try:
+            while inflight:
+                done, inflight = await asyncio.wait(inflight, return_when=asyncio.FIRST_COMPLETED)
+                
+                for task in done:
+                    i += 1
+                    filename, success, error, execution_time = task.result()
+                    
+                    if success:
+                        out.log(f"[{i:2d}/{total_files}] {filename:<40} {GREEN}✓ {execution_time:6.2f}s{NC}")
+                    else:
+                        out.log(f"[{i:2d}/{total_files}] {filename:<40} {RED}✗ {execution_time:6.2f}s{NC}")
+                    results.append((filename, success, error, execution_time))
+                    
+                    writer.writerow({
+                        'filename': filename,
+                        'status': 'success' if success else 'failed',
+                        'execution_time_seconds': f'{execution_time:.2f}',
+                        'error_message': error if error else ''
+                    })
+                    result_file.flush()
+                
+                for input_file in islice(pending_files, len(done)):
+                    inflight.add(asyncio.create_task(allocate_file(input_file, allocated_dir / os.path.basename(input_file), pool)))
+        finally:
+            # Whatever is still buffered goes out even if the run is interrupted
+            out.flush()
+    
+    return results
 
 def create_plots_from_analysis_csv(analysis_csv):
     """
@@ -135,14 +313,36 @@ def create_plots_from_analysis_csv(analysis_csv):
         print(f"{YELLOW}Warning: Analysis CSV not found, skipping plot generation{NC}")
         return
     
+    # Read here rather than at import, so a bad value can't break importing this module
+    plot_dpi = os.environ.get('PLOT_DPI', str(DEFAULT_PLOT_DPI))
+    try:
+        plot_dpi = int(plot_dpi)
+        if plot_dpi <= 0:
+            raise ValueError
+    except ValueError:
+        print(f"{YELLOW}Warning: invalid PLOT_DPI '{plot_dpi}', using {DEFAULT_PLOT_DPI}{NC}")
+        plot_dpi = DEFAULT_PLOT_DPI
+    
+    # The plotting stack is only loaded when a plot is actually drawn
+    try:
+        import pandas as pd
+        import matplotlib
+        # Only files are written, so skip interactive backend selection
+        matplotlib.use('Agg')
+        import matplotlib.pyplot as plt
+    except ImportError as e:
+        print(f"{YELLOW}Warning: {e.name} not available, skipping plot generation{NC}")
+        return
+    
     try:
-        if pd is None:
-            print(f"{YELLOW}Warning: pandas not available, skipping plot generation{NC}")
-            return
-            
         # Read analysis CSV
         df = pd.read_csv(analysis_csv)
         
+        # Base config of each plot as plain floats (NaN where the column is the varying one)
+        base_cols = ['txn_count', 'op_per_txn', 'max_key', 'read_only_percent']
+        df[base_cols] = df[base_cols].apply(pd.to_numeric, errors='coerce')
+        base_rows = df.drop_duplicates('plot').set_index('plot')[base_cols].to_dict(orient='index')
+        
         # Create a unified figure with 3 subplots in a row
         fig, axes = plt.subplots(1, 3, figsize=(20, 6))
         fig.suptitle('Allocation Performance vs Workload Parameters', fontsize=16, fontweight='bold')
@@ -161,33 +361,32 @@ def create_plots_from_analysis_csv(analysis_csv):
             'max_key': 'Max Key ID (in thousands)'
         }
         
+        # Split the analysis rows by plot once instead of masking the frame per subplot
+        groups = dict(list(df.groupby('plot', sort=False)))
+        
         # Plot data for each parameter
         for plot_name, ax in plot_positions.items():
-            plot_df = df[df['plot'] == plot_name]
+            plot_df = groups.get(plot_name)
             
-            if plot_df.empty:
+            if plot_df is None:
                 ax.text(0.5, 0.5, 'No data', ha='center', va='center', transform=ax.transAxes)
                 ax.set_title(plot_name)
                 continue
             
             # Extract data
-            x_values = plot_df['vary_value'].values
-            y_means = plot_df['mean'].values
-            y_stds = plot_df['std'].values
+            arr = plot_df[['vary_value', 'mean', 'std']].to_numpy(dtype=float)
+            x_values, y_means, y_stds = arr[:, 0], arr[:, 1], arr[:, 2]
             
             # Get varying parameter name
             vary_param = plot_df['vary_variable'].iloc[0]
             
-            # Get base config from first row
+            base = base_rows[plot_name]
             base_config_items = []
-            if pd.notna(plot_df['txn_count'].iloc[0]) and plot_df['txn_count'].iloc[0] != '':
-                base_config_items.append(f"txn={int(plot_df['txn_count'].iloc[0])}")
-            if pd.notna(plot_df['op_per_txn'].iloc[0]) and plot_df['op_per_txn'].iloc[0] != '':
-                base_config_items.append(f"ops={int(plot_df['op_per_txn'].iloc[0])}")
-            if pd.notna(plot_df['max_key'].iloc[0]) and plot_df['max_key'].iloc[0] != '':
-                base_config_items.append(f"key={int(plot_df['max_key'].iloc[0])}")
-            if pd.notna(plot_df['read_only_percent'].iloc[0]) and plot_df['read_only_percent'].iloc[0] != '':
-                base_config_items.append(f"ro={int(plot_df['read_only_percent'].iloc[0])}%")
+            for column, label, suffix in (('txn_count', 'txn', ''), ('op_per_txn', 'ops', ''),
+                                          ('max_key', 'key', ''), ('read_only_percent', 'ro', '%')):
+                value = base[column]
+                if value == value:  # skip NaN
+                    base_config_items.append(f"{label}={int(value)}{suffix}")
             
             base_config_str = ', '.join(base_config_items)
             
@@ -203,11 +402,12 @@ def create_plots_from_analysis_csv(analysis_csv):
             ax.grid(True, alpha=0.3, linestyle='--')
             ax.legend(loc='best', fontsize=10)
         
-        plt.tight_layout()
+        # Lay out once here; bbox_inches='tight' would render the figure a second time
+        plt.tight_layout(rect=[0, 0, 1, 0.95])
         
         # Save unified figure
         output_file = analysis_csv.parent / 'allocation_performance_unified.png'
-        plt.savefig(output_file, dpi=300, bbox_inches='tight')
+        plt.savefig(output_file, dpi=plot_dpi)
         print(f"{GREEN}✓ Unified plot saved to {output_file}{NC}")
         plt.close()
         
@@ -215,46 +415,47 @@ def create_plots_from_analysis_csv(analysis_csv):
         print(f"{RED}Error creating plots: {e}{NC}")
         plt.close()
 
-def generate_analysis_csv(result_csv, analysis_csv):
+def workload_record(filename, execution_time):
+    """
+    Parse a workload filename into the record used by generate_analysis_csv
+    Returns: dict of workload parameters and execution_time, or None if the name doesn't match
+    """
+    match = _WORKLOAD_RE.match(filename)
+    if not match:
+        return None
+    txns, max_ops, max_key, read_only, case_num = map(int, match.groups())
+    return {
+        'txns': txns,
+        'max_ops': max_ops,
+        'max_key': max_key,
+        'read_only': read_only,
+        'case_num': case_num,
+        'execution_time': execution_time
+    }
+
+def mean_and_pstdev(values):
+    """
+    Mean and population standard deviation in a single pass (Welford's method)
+    Returns: (mean, std)
+    """
+    mean = 0.0
+    m2 = 0.0
+    for i, x in enumerate(values, 1):
+        delta = x - mean
+        mean += delta / i
+        m2 += delta * (x - mean)
+    return (mean, math.sqrt(m2 / len(values)))
+
+# generate_analysis_csv is the only place the per-parameter statistics are computed;
+# the plot is drawn from its output by create_plots_from_analysis_csv
+def generate_analysis_csv(records, analysis_csv, use_pandas=True):
     """
     Generate analysis CSV with statistics grouped by varying parameters.
+    records are the successful runs as produced by workload_record; with
+    use_pandas=False (or without pandas) plain Python is used instead.
     Format: plot, vary_variable, vary_value, txn_count, op_per_txn, max_key, read_only_percent, mean, std, sample_count
     """
-    if not result_csv.exists():
-        print(f"{YELLOW}Warning: Performance CSV not found{NC}")
-        return False
-    
-    # Parse raw performance data
-    all_data = []
-    try:
-        with open(result_csv, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                if row['status'] != 'success':
-                    continue
-                
-                filename = row['filename']
-                execution_time = float(row['execution_time_seconds'])
-                
-                # Parse filename: workload_{txns}t_{max_ops}o_{max_key}k_{read_only}r_{case_num}.json
-                match = re.match(
-                    r'workload_(\d+)t_(\d+)o_(\d+)k_(\d+)r_(\d+)\.json',
-                    filename
-                )
-                
-                if match:
-                    txns, max_ops, max_key, read_only, case_num = map(int, match.groups())
-                    all_data.append({
-                        'txns': txns,
-                        'max_ops': max_ops,
-                        'max_key': max_key,
-                        'read_only': read_only,
-                        'case_num': case_num,
-                        'execution_time': execution_time
-                    })
-    except Exception as e:
-        print(f"{RED}Error reading performance CSV: {e}{NC}")
-        return False
+    all_data = records
     
     if not all_data:
         print(f"{YELLOW}Warning: No valid data found{NC}")
@@ -273,48 +474,101 @@ def generate_analysis_csv(result_csv, analysis_csv):
         'read_only': 'read_only_vs_time'
     }
     
-    for varying_param, plot_name in varying_params.items():
-        # Get other parameters
-        other_params = {'txns', 'max_ops', 'max_key', 'read_only'} - {varying_param}
-        
-        # Find most common values for other parameters
-        param_counts = {}
-        for param in other_params:
-            param_counts[param] = Counter(item[param] for item in all_data)
+    # Base configuration column for each workload parameter
+    base_columns = {
+        'txns': 'txn_count',
+        'max_ops': 'op_per_txn',
+        'max_key': 'max_key',
+        'read_only': 'read_only_percent'
+    }
+    
+    pd = None
+    if use_pandas:
+        try:
+            import pandas as pd
+        except ImportError:
+            pd = None
+    
+    df = pd.DataFrame(all_data) if pd is not None else None
+    
+    if df is not None:
+        # One fused aggregation for all plots: each parameter's base-config slice is stacked
+        # into a long (vary_variable, vary_value, execution_time) frame and reduced by one groupby.
+        # value_counts(sort=False) keeps first-seen order, so idxmax breaks ties like Counter.most_common
+        base_config = {param: df[param].value_counts(sort=False).idxmax() for param in base_columns}
         
-        base_config = {param: param_counts[param].most_common(1)[0][0] 
-                      for param in other_params}
+        longs = []
+        for varying_param in varying_params:
+            other_params = [param for param in base_columns if param != varying_param]
+            mask = (df[other_params] == pd.Series({param: base_config[param] for param in other_params})).all(axis=1)
+            longs.append(pd.DataFrame({
+                'vary_variable': varying_param,
+                'vary_value': df.loc[mask, varying_param],
+                'execution_time': df.loc[mask, 'execution_time']
+            }))
+        long = pd.concat(longs, ignore_index=True)
+        # Categorical keeps the plots in varying_params order rather than alphabetical
+        long['vary_variable'] = pd.Categorical(long['vary_variable'], categories=list(varying_params), ordered=True)
         
-        # Filter data matching base configuration
-        filtered_data = [item for item in all_data 
-                        if all(item[param] == base_config[param] for param in other_params)]
+        times = long.groupby(['vary_variable', 'vary_value'], observed=True)['execution_time']
+        stats = pd.DataFrame({
+            'mean': times.mean(),
+            'std': times.std(ddof=0),  # population std, as mean_and_pstdev
+            'sample_count': times.size()
+        }).reset_index()
+        stats['vary_variable'] = stats['vary_variable'].astype(str)
+        stats['vary_value'] = stats['vary_value'].astype(float)
+        stats['plot'] = stats['vary_variable'].map(varying_params)
+        for param, column in base_columns.items():
+            stats[column] = pd.Series(float(base_config[param]), index=stats.index, dtype=object).where(
+                stats['vary_variable'] != param, '')
         
-        # Group by varying parameter value
-        grouped = defaultdict(list)
-        for item in filtered_data:
-            param_value = item[varying_param]
-            grouped[param_value].append(item['execution_time'])
+        analysis_data = stats.to_dict('records')
+    else:
+        # Without pandas, count every parameter's values in a single pass up front
+        per_field = {param: Counter() for param in base_columns}
+        for item in all_data:
+            for param, counter in per_field.items():
+                counter[item[param]] += 1
         
-        # Create analysis rows
-        for param_value in sorted(grouped.keys()):
-            times = grouped[param_value]
-            mean_time = np.mean(times)
-            std_time = np.std(times)
-            sample_count = len(times)
+        for varying_param, plot_name in varying_params.items():
+            # Get other parameters
+            other_params = {'txns', 'max_ops', 'max_key', 'read_only'} - {varying_param}
             
-            row = {
-                'plot': plot_name,
-                'vary_variable': varying_param,
-                'vary_value': float(param_value),
-                'txn_count': float(base_config['txns']) if 'txns' in base_config else '',
-                'op_per_txn': float(base_config['max_ops']) if 'max_ops' in base_config else '',
-                'max_key': float(base_config['max_key']) if 'max_key' in base_config else '',
-                'read_only_percent': float(base_config['read_only']) if 'read_only' in base_config else '',
-                'mean': mean_time,
-                'std': std_time,
-                'sample_count': sample_count
-            }
-            analysis_data.append(row)
+            # Find most common values for other parameters
+            base_config = {param: per_field[param].most_common(1)[0][0] 
+                          for param in other_params}
+            
+            # Filter data matching base configuration with one tuple comparison per item
+            key_fn = itemgetter(*other_params)
+            target = tuple(base_config[param] for param in other_params)
+            filtered_data = [item for item in all_data if key_fn(item) == target]
+            
+            # Group by varying parameter value
+            grouped = defaultdict(list)
+            for item in filtered_data:
+                param_value = item[varying_param]
+                grouped[param_value].append(item['execution_time'])
+            
+            # Create analysis rows
+            for param_value in sorted(grouped.keys()):
+                times = grouped[param_value]
+                mean_time, std_time = mean_and_pstdev(times)
+                sample_count = len(times)
+            
+                row = {
+                    'plot': plot_name,
+                    'vary_variable': varying_param,
+                    'vary_value': float(param_value),
+                    'txn_count': float(base_config['txns']) if 'txns' in base_config else '',
+                    'op_per_txn': float(base_config['max_ops']) if 'max_ops' in base_config else '',
+                    'max_key': float(base_config['max_key']) if 'max_key' in base_config else '',
+                    'read_only_percent': float(base_config['read_only']) if 'read_only' in base_config else '',
+                    'mean': mean_time,
+                    'std': std_time,
+                    'sample_count': sample_count
+                }
+                analysis_data.append(row)
     
     # Write to CSV
     try:
@@ -330,167 +584,46 @@ def generate_analysis_csv(result_csv, analysis_csv):
         print(f"{RED}Error writing analysis CSV: {e}{NC}")
         return False
 
-def parse_csv_and_create_plots(result_csv):
+def main():
+    parser = argparse.ArgumentParser(
+        description='Allocate isolation levels to random workloads and record execution times'
+    )
+    
+    parser.add_argument(
+        '--no-plots',
+        action='store_true',
+        help='Skip the plot and compute the analysis without pandas/numpy'
+    )
+    
+    parser.add_argument(
+        '-j', '--jobs',
+        type=int,
+        default=None,
+        help='Number of JVM workers (default: number of usable CPU cores)'
+    )
+    
+    parser.add_argument(
+        '--jvm-heap',
+        default=None,
+        help='Maximum heap per JVM worker, passed as -Xmx (e.g. 512m, 2g)'
+    )
+    
+    args = parser.parse_args()
+    
+    return run(no_plots=args.no_plots, jobs=args.jobs, jvm_heap=args.jvm_heap)
+
+def run(no_plots: bool = False, jobs: Optional[int] = None, jvm_heap: Optional[str] = None) -> int:
     """
-    Parse the CSV file and create performance visualization plots.
-    Analyzes single variables by grouping data with identical other parameters.
+    Allocate all random workloads in-process, as main() does for the command line
+    Returns: process exit code (0 on success)
     """
-    if not result_csv.exists():
-        print(f"{YELLOW}Warning: CSV file not found, skipping plot generation{NC}")
-        return
-    
-    # List to store all parsed data
-    all_data = []
+    if jobs is not None and jobs <= 0:
+        print(f"{RED}Error: jobs must be positive{NC}")
+        return 1
     
-    try:
-        with open(result_csv, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                # Only consider successful executions
-                if row['status'] != 'success':
-                    continue
-                
-                filename = row['filename']
-                execution_time = float(row['execution_time_seconds'])
-                
-                # Parse filename: workload_{txns}t_{max_ops}o_{max_key}k_{read_only}r_{case_num}.json
-                match = re.match(
-                    r'workload_(\d+)t_(\d+)o_(\d+)k_(\d+)r_(\d+)\.json',
-                    filename
-                )
-                
-                if match:
-                    txns, max_ops, max_key, read_only, case_num = map(int, match.groups())
-                    all_data.append({
-                        'txns': txns,
-                        'max_ops': max_ops,
-                        'max_key': max_key,
-                        'read_only': read_only,
-                        'case_num': case_num,
-                        'execution_time': execution_time
-                    })
-        
-        if not all_data:
-            print(f"{YELLOW}Warning: No valid data found in CSV{NC}")
-            return
-        
-        # Create figure with 3 subplots in a row
-        fig, axes = plt.subplots(1, 3, figsize=(18, 6))
-        fig.suptitle('Allocation Performance vs Workload Parameters', fontsize=16, fontweight='bold')
-        
-        # Helper function to analyze single variable
-        def get_single_variable_data(data, varying_param):
-            """Group data by varying parameter, keeping other parameters constant"""
-            grouped = {}
-            
-            for item in data:
-                key = (
-                    item['txns'],
-                    item['max_ops'],
-                    item['max_key']
-                )
-                
-                if key not in grouped:
-                    grouped[key] = {}
-                
-                param_value = item[varying_param]
-                if param_value not in grouped[key]:
-                    grouped[key][param_value] = []
-                
-                grouped[key][param_value].append(item['execution_time'])
-            
-            # For each configuration of other parameters, collect the times for this parameter
-            result = {}
-            for config, param_times in grouped.items():
-                # Only use configurations where other params are fixed (have data for all cases of varying_param)
-                for param_value, times in param_times.items():
-                    if param_value not in result:
-                        result[param_value] = []
-                    result[param_value].extend(times)
-            
-            return result
-        
-        # Better approach: find base configuration and vary one parameter
-        def get_varied_data(data, varying_param):
-            """Extract data varying one parameter while others are fixed"""
-            # Find the most common values for other parameters (representing base config)
-            from collections import Counter
-            
-            other_params = {'txns', 'max_ops', 'max_key'} - {varying_param}
-            
-            param_counts = {}
-            for param in other_params:
-                param_counts[param] = Counter(item[param] for item in data)
-            
-            # Get most common value for each other parameter
-            base_config = {param: param_counts[param].most_common(1)[0][0] 
-                          for param in other_params}
-            
-            # Filter data matching base configuration
-            filtered_data = [item for item in data 
-                           if all(item[param] == base_config[param] for param in other_params)]
-            
-            # Group by varying parameter
-            result = {}
-            for item in filtered_data:
-                param_value = item[varying_param]
-                if param_value not in result:
-                    result[param_value] = []
-                result[param_value].append(item['execution_time'])
-            
-            return result, base_config
-        
-        # Helper function to plot a parameter with line chart
-        def plot_parameter(ax, param_name, data, xlabel):
-            varied_data, base_config = get_varied_data(data, param_name)
-            
-            if not varied_data:
-                ax.text(0.5, 0.5, 'No data', ha='center', va='center', transform=ax.transAxes)
-                ax.set_title(param_name)
-                return
-            
-            # Sort by parameter value
-            sorted_items = sorted(varied_data.items(), key=lambda x: x[0])
-            x_values = [x[0] for x in sorted_items]
-            y_means = [np.mean(y) for _, y in sorted_items]
-            y_stds = [np.std(y) if len(y) > 1 else 0 for _, y in sorted_items]
-            
-            # Plot line chart with error bars
-            ax.errorbar(x_values, y_means, yerr=y_stds, marker='o', linewidth=2, 
-                       markersize=8, capsize=5, color='steelblue', ecolor='steelblue',
-                       label='Execution time')
-            
-            ax.set_xlabel(xlabel)
-            ax.set_ylabel('Execution Time (seconds)')
-            ax.set_title(f'Performance vs {param_name}')
-            ax.grid(True, alpha=0.3)
-            
-            # Add base configuration info to title
-            other_params = {'txns', 'max_ops', 'max_key', 'read_only'} - {param_name}
-            config_str = ', '.join([f"{p}={base_config[p]}" for p in sorted(other_params)])
-            ax.set_title(f'Performance vs {param_name}\n(Base config: {config_str})', fontsize=11)
-        
-        # Plot each parameter
-        plot_parameter(axes[0], 'txns', all_data, 'Number of Transactions')
-        plot_parameter(axes[1], 'max_ops', all_data, 'Max Operations per Txn')
-        plot_parameter(axes[2], 'max_key', all_data, 'Max Key ID (in thousands)')
-        
-        plt.tight_layout()
-        
-        # Save the plot
-        output_file = result_csv.parent / 'allocation_performance.png'
-        plt.savefig(output_file, dpi=300, bbox_inches='tight')
-        print(f"{GREEN}✓ Performance plot saved to {output_file}{NC}")
-        plt.close()
-        
-    except ImportError:
-        print(f"{YELLOW}Warning: matplotlib not available, skipping plot generation{NC}")
-    except Exception as e:
-        print(f"{RED}Error creating plots: {e}{NC}")
-
-def main():
+    # Every path below is absolute, so run() leaves the caller's cwd alone; it is
+    # also called in-process by the experiment driver
     project_dir = get_project_dir()
-    os.chdir(project_dir)
     
     random_workload_dir = project_dir / 'data' / 'random_workload'
     allocated_dir = project_dir / 'data' / 'allocated_random_workload'
@@ -514,8 +647,10 @@ def main():
     try:
         result = subprocess.run(
             ['mvn', 'clean', 'compile', 'dependency:copy-dependencies'],
-            capture_output=True,
-            encoding='utf-8',
+            cwd=project_dir,
+            # Build output is never inspected; stderr stays bytes and is only decoded on failure
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
             timeout=300
         )
         if result.returncode == 0:
@@ -523,6 +658,9 @@ def main():
             print(f"{GREEN}✓ Java code compiled successfully{NC}")
         else:
             print(f"{YELLOW}Warning: Maven compilation failed{NC}")
+            error_msg = result.stderr[:4096].decode('utf-8', errors='ignore').strip()
+            if error_msg:
+                print(error_msg)
             print(f"{YELLOW}Checking for existing compiled classes...{NC}")
     except Exception as e:
         print(f"{YELLOW}Warning: Failed to run Maven: {e}{NC}")
@@ -554,7 +692,9 @@ def main():
         classpath = ':'.join(classpath_parts)
     
     # Find all workload files
-    workload_files = sorted(random_workload_dir.glob('*.json'))
+    # One directory read with no extra stat per entry; no sort, the list is shuffled below
+    with os.scandir(random_workload_dir) as it:
+        workload_files = [entry.path for entry in it if entry.name.endswith('.json') and entry.is_file()]
     total_files = len(workload_files)
     
     if total_files == 0:
@@ -569,74 +709,67 @@ def main():
     print(f"Execution order: randomized{NC}")
     print()
     
-    # Track performance data
-    performance_data: List[Dict] = []
-    
     # Process files in parallel
     successful = 0
     failed = 0
     failed_files = []
     total_time = 0
     
-    max_workers = 4  # Limit concurrent allocations
+    # The allocator is CPU-bound, so run one JVM per usable core (respecting affinity/cgroups)
+    if jobs is not None:
+        max_workers = jobs
+    else:
+        try:
+            max_workers = len(os.sched_getaffinity(0))
+        except AttributeError:
+            max_workers = os.cpu_count() or 4
     
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        futures = {}
-        
-        for input_file in workload_files:
-            output_file = allocated_dir / input_file.name
-            future = executor.submit(
-                allocate_file,
-                input_file,
-                output_file,
-                classpath
-            )
-            futures[future] = input_file.name
-        
-        for i, future in enumerate(as_completed(futures), 1):
-            filename, success, error, execution_time = future.result()
-            total_time += execution_time
-            
-            # Record performance data
-            performance_data.append({
-                'filename': filename,
-                'status': 'success' if success else 'failed',
-                'execution_time_seconds': f'{execution_time:.2f}',
-                'error_message': error if error else ''
-            })
-            
-            if success:
-                print(f"[{i:2d}/{total_files}] {filename:<40} {GREEN}✓ {execution_time:6.2f}s{NC}")
-                successful += 1
-            else:
-                print(f"[{i:2d}/{total_files}] {filename:<40} {RED}✗ {execution_time:6.2f}s{NC}")
-                failed += 1
-                failed_files.append(filename)
+    java_cmd = resolve_java_cmd()
     
-    # Write performance data to CSV (intermediate file)
+    # Performance data goes to the CSV (intermediate file) as each file completes
     csv_dir = result_csv.parent
     csv_dir.mkdir(parents=True, exist_ok=True)
     
     try:
-        with open(result_csv, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.DictWriter(
-                f,
-                fieldnames=['filename', 'status', 'execution_time_seconds', 'error_message']
-            )
-            writer.writeheader()
-            writer.writerows(performance_data)
-    except Exception as e:
+        result_file = open(result_csv, 'w', newline='', encoding='utf-8')
+    except OSError as e:
         print(f"\n{RED}✗ Failed to write CSV: {e}{NC}")
         return 1
     
+    # A single event loop waits on all JVM workers; no thread per in-flight job
+    with result_file:
+        try:
+            results = asyncio.run(allocate_all(workload_files, allocated_dir, java_cmd, classpath, max_workers, result_file, jvm_heap=jvm_heap))
+        except OSError as e:
+            print(f"{RED}Error: Failed to start Java workers: {e}{NC}")
+            return 1
+    
+    # Successful runs are parsed into analysis records here, so the raw CSV
+    # is only ever written, never read back
+    records = []
+    
+    for filename, success, error, execution_time in results:
+        total_time += execution_time
+        
+        if success:
+            successful += 1
+            # Use the same 2-decimal value as the CSV so both agree
+            record = workload_record(filename, float(f'{execution_time:.2f}'))
+            if record is not None:
+                records.append(record)
+        else:
+            failed += 1
+            failed_files.append(filename)
+    
     # Generate analysis CSV with statistics
     print()
     analysis_csv = csv_dir / 'allocation_performance_analysis.csv'
-    generate_analysis_csv(result_csv, analysis_csv)
+    generate_analysis_csv(records, analysis_csv, use_pandas=not no_plots)
     
     # Create unified visualization plot from analysis CSV
-    print()
-    create_plots_from_analysis_csv(analysis_csv)
+    if not no_plots:
+        print()
+        create_plots_from_analysis_csv(analysis_csv)
     
     print()
     print("=" * 50)
@@ -657,15 +790,17 @@ def main():
     else:
         print(f"{GREEN}All allocations completed successfully!{NC}")
         print()
-        allocated_count = len(list(allocated_dir.glob('*.json')))
+        with os.scandir(allocated_dir) as it:
+            allocated_count = sum(1 for entry in it if entry.name.endswith('.json'))
         print(f"Output directory: {allocated_dir}")
         print(f"{allocated_count} files allocated")
         print()
         print("Generated files:")
         analysis_csv = result_csv.parent / 'allocation_performance_analysis.csv'
         print(f"  {analysis_csv}")
-        unified_plot = result_csv.parent / 'allocation_performance_unified.png'
-        print(f"  {unified_plot}")
+        if not no_plots:
+            unified_plot = result_csv.parent / 'allocation_performance_unified.png'
+            print(f"  {unified_plot}")
         print()
         print(f"Completed at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
         return 0
@@ -9,11 +9,28 @@ import os
 import sys
 import json
 import random
+import hashlib
+import functools
 import argparse
 import subprocess
 from pathlib import Path
 from datetime import datetime
-from typing import List, Dict, Any
+from itertools import repeat
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Any, Iterable, Callable, Tuple
+try:
+    import orjson
+except ImportError:
+    orjson = None
+try:
+    import numpy as np
+except ImportError:
+    np = None
+try:
+    from tqdm import tqdm
+except ImportError:
+    tqdm = None
 
 # Set UTF-8 encoding for Windows compatibility
 if sys.platform == 'win32':
@@ -26,104 +43,273 @@ YELLOW = '\033[1;33m'
 CYAN = '\033[0;36m'
 NC = '\033[0m'
 
+# Stdlib encoders for when orjson is missing, built once rather than per json.dumps call
+COMPACT_ENCODER = json.JSONEncoder(separators=(',', ':'))
+PRETTY_ENCODER = json.JSONEncoder(indent=2)
+
+# Output files are written through a 1 MiB buffer to keep write() calls few
+WRITE_BUFFER_SIZE = 1 << 20
+
+def dump_transaction(txn: Dict[str, Any], pretty: bool = False) -> bytes:
+    """Encode one transaction as compact (or 2-space indented) JSON, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(txn, option=orjson.OPT_INDENT_2 if pretty else None)
+    return (PRETTY_ENCODER if pretty else COMPACT_ENCODER).encode(txn).encode('utf-8')
+
+def write_workload(output_file: Path, transactions: Iterable[Dict[str, Any]], pretty: bool = False) -> Tuple[int, int]:
+    """
+    Stream {"templates": [...]} to disk one transaction at a time, producing the same
+    bytes as dumping the whole workload at once (compact, or indented with pretty)
+    Returns: (transactions written, bytes written)
+    """
+    if pretty:
+        head, first_sep, sep, tail, empty_tail = b'{\n  "templates": [', b'\n    ', b',\n    ', b'\n  ]\n}', b']\n}'
+    else:
+        head, first_sep, sep, tail, empty_tail = b'{"templates":[', b'', b',', b']}', b']}'
+    
+    count = 0
+    size = len(head)
+    with open(output_file, 'wb', buffering=WRITE_BUFFER_SIZE) as f:
+        f.write(head)
+        for txn in transactions:
+            data = dump_transaction(txn, pretty)
+            if pretty:
+                data = data.replace(b'\n', b'\n    ')
+            size += f.write(sep if count else first_sep)
+            size += f.write(data)
+            count += 1
+        size += f.write(tail if count else empty_tail)
+    return count, size
+
+# Instantiated operation lists kept per generator for parameter-only templates
+INSTANTIATE_CACHE_SIZE = 65536
+
+_worker_generator = None
+
+def _generate_benchmark(generator_args, benchmark_name, templates, case_nums, bench_workload_dir):
+    """
+    Worker entry point: generate a batch of cases of one benchmark in the pool process.
+    The generator is reused across the tasks a worker runs so its caches carry over;
+    generate_case reseeds it for every case.
+    Returns: list of written workload files, in case order
+    """
+    global _worker_generator
+    if _worker_generator is None:
+        _worker_generator = WorkloadGenerator(*generator_args)
+    return [
+        _worker_generator.generate_case(benchmark_name, templates, case_num, bench_workload_dir)
+        for case_num in case_nums
+    ]
+
 class WorkloadGenerator:
     """Generate benchmark workloads from templates"""
     
-    def __init__(self, total_txns: int = 10000, max_key: int = 1000, cases: int = 20):
+    def __init__(self, total_txns: int = 10000, max_key: int = 1000, cases: int = 20, pretty: bool = False):
         self.total_txns = total_txns
         self.max_key = max_key
         self.cases = cases
+        self.pretty = pretty
         self.random = random.Random()
+        self._randbelow = self.random._randbelow
+        # numpy generator for bulk draws, reseeded per case; None without numpy
+        self.rng = None
+        # table -> instance number -> "table_n"; random keys repeat often within
+        # the 1..max_key range, so each name is formatted once and reused
+        self._table_key_cache = defaultdict(dict)
+        # (benchmark, template index) -> compiled instantiation function
+        self._compiled = {}
+        # benchmark -> per-template (counts, template keys, cacheable flags)
+        self._prepared = {}
+        self._instantiate_cached = functools.lru_cache(maxsize=INSTANTIATE_CACHE_SIZE)(self._instantiate_params)
         
+    @staticmethod
+    def _seed(*parts) -> int:
+        """Derive a deterministic 64-bit seed from the SHA-256 of the given parts"""
+        return int.from_bytes(hashlib.sha256(repr(parts).encode()).digest()[:8], 'big')
+    
     def get_project_dir(self) -> Path:
         """Get project root directory"""
         return Path(__file__).parent.parent.absolute()
     
-    def instantiate_template(self, template_ops: List[Dict], param_values: Dict[str, int]) -> List[Dict]:
+    def _random_key(self, table: str) -> str:
+        """Draw a random instance of a table, reusing the cached 'table_n' name"""
+        instance_num = self._randbelow(self.max_key) + 1
+        key_cache = self._table_key_cache[table]
+        concrete_key = key_cache.get(instance_num)
+        if concrete_key is None:
+            concrete_key = key_cache[instance_num] = f"{table}_{instance_num}"
+        return concrete_key
+    
+    def _compile_template(self, template_ops: List[Dict], params: Iterable[str]) -> Callable[[Dict[str, int]], List[Dict]]:
         """
-        Convert template operations to concrete program instance operations.
-        - Operations with parameters use the provided parameter values to determine instance numbers
-          Example: READ Account with param "N1" where N1=5 becomes READ Account_5
-        - UPDATE operations convert to READ + WRITE on same variable
-        - Parameters must be resolved from param_values - if a parameter is missing, it's an error
-        - If params is a list, the values are concatenated with "_"
+        Specialize template operations into a function from param_values to concrete operations.
+        Parameter references, key joining and UPDATE expansion are resolved once here
+        instead of for every instance; see instantiate_template for the rules.
         """
-        concrete_ops = []
+        params = set(params)
+        steps = []
         
         for op in template_ops:
             table = op['key']
-            op_id = op['id']
-            op_type = op['type']
             param_ref = op.get('params')  # Can be string or list
             
-            # Determine the instance number(s)
-            instance_nums = []
-            if param_ref is not None:
+            if param_ref is None:
+                # No parameter reference, use random
+                key_fn = lambda param_values, table=table: self._random_key(table)
+            else:
                 # Handle both string and list param references
-                if isinstance(param_ref, list):
-                    # Multiple parameters - get all their values
-                    for param_name in param_ref:
-                        if param_name not in param_values:
-                            raise ValueError(f"Parameter '{param_name}' not found in param_values: {param_values.keys()}")
-                        instance_nums.append(str(param_values[param_name]))
-                else:
-                    # Single parameter
-                    if param_ref not in param_values:
-                        raise ValueError(f"Parameter '{param_ref}' not found in param_values: {param_values.keys()}")
-                    instance_nums.append(str(param_values[param_ref]))
+                names = tuple(param_ref) if isinstance(param_ref, list) else (param_ref,)
+                for param_name in names:
+                    if param_name not in params:
+                        raise ValueError(f"Parameter '{param_name}' not found in param_values: {params}")
                 
-                # Create concrete key by joining instance numbers
-                concrete_key = table + "_" + "_".join(instance_nums)
-            else:
-                # No parameter reference, use random
-                instance_num = self.random.randint(1, self.max_key)
-                concrete_key = f"{table}_{instance_num}"
+                if len(names) == 1:
+                    key_fn = lambda param_values, prefix=table + "_", name=names[0]: prefix + str(param_values[name])
+                else:
+                    # Multiple parameters - concatenate their values with "_"
+                    key_fn = lambda param_values, prefix=table + "_", names=names: prefix + "_".join(
+                        [str(param_values[name]) for name in names])
             
             # Handle UPDATE as both READ and WRITE on the same variable
-            if op_type == 'UPDATE':
-                concrete_ops.append({
-                    'id': op_id,
-                    'type': 'READ',
-                    'key': concrete_key
-                })
-                concrete_ops.append({
-                    'id': op_id,
-                    'type': 'WRITE',
-                    'key': concrete_key
-                })
-            else:
-                # For READ and other operations
-                concrete_ops.append({
-                    'id': op_id,
-                    'type': op_type,
-                    'key': concrete_key
-                })
+            op_types = ('READ', 'WRITE') if op['type'] == 'UPDATE' else (op['type'],)
+            steps.append((op['id'], op_types, key_fn))
+        
+        def instantiate(param_values: Dict[str, int]) -> List[Dict]:
+            concrete_ops = []
+            append = concrete_ops.append
+            for op_id, op_types, key_fn in steps:
+                concrete_key = key_fn(param_values)
+                for op_type in op_types:
+                    append({'id': op_id, 'type': op_type, 'key': concrete_key})
+            return concrete_ops
         
-        return concrete_ops
+        return instantiate
     
-    def generate_from_benchmarks(self):
-        """Generate workloads from benchmark templates"""
-        project_dir = self.get_project_dir()
-        benchmark_dir = project_dir / 'data' / 'benchmarks'
-        bench_workload_dir = project_dir / 'data' / 'bench_workload'
+    def instantiate_template(self, template_ops: List[Dict], param_values: Dict[str, int]) -> List[Dict]:
+        """
+        Convert template operations to concrete program instance operations.
+        - Operations with parameters use the provided parameter values to determine instance numbers
+          Example: READ Account with param "N1" where N1=5 becomes READ Account_5
+        - UPDATE operations convert to READ + WRITE on same variable
+        - Parameters must be resolved from param_values - if a parameter is missing, it's an error
+        - If params is a list, the values are concatenated with "_"
+        """
+        return self._compile_template(template_ops, param_values.keys())(param_values)
+    
+    def _instantiate_params(self, template_key: tuple, param_items: tuple) -> List[Dict]:
+        """Uncached body of _instantiate_cached for a parameter-only template"""
+        return self._compiled[template_key](dict(param_items))
+    
+    def instantiate_transaction(self, template: Dict, instance: int, param_row: List[int],
+                                template_key: tuple, cacheable: bool = False) -> Dict:
+        """
+        Instantiate one transaction of a compiled template from its pre-drawn parameter values.
+        Cacheable templates share operation lists for equal parameters.
+        """
+        name = template.get('name', 'unknown')
+        isolation_level = template.get('isolationLevel', 'SERIALIZABLE')
+        params = template.get('params', [])  # Get parameter names
         
-        print("=" * 50)
-        print("Benchmark Workload Generator")
-        print("=" * 50)
-        print()
+        if cacheable:
+            concrete_ops = self._instantiate_cached(template_key, tuple(zip(params, param_row)))
+        else:
+            concrete_ops = self._compiled[template_key](dict(zip(params, param_row)))
         
-        # Recompile Java code
-        print(f"{CYAN}Recompiling Java code...{NC}")
+        return {
+            'name': f"{name}_{instance}",
+            'isolationLevel': isolation_level,
+            'operations': concrete_ops
+        }
+    
+    def prepare_benchmark(self, benchmark_name: str, templates: List[Dict]):
+        """
+        Compile a benchmark's templates once and cache what does not change between cases
+        Returns: (instance counts, template keys, cacheable flags), one entry per template
+        """
+        prepared = self._prepared.get(benchmark_name)
+        if prepared is not None:
+            return prepared
+        
+        counts = []
+        template_keys = []
+        cacheable = []
+        for template_idx, template in enumerate(templates):
+            # Generate instances based on percentage
+            counts.append(max(1, round(self.total_txns * template.get('percentage', 0.05))))
+            
+            template_key = (benchmark_name, template_idx)
+            operations = template.get('operations', [])
+            self._compiled[template_key] = self._compile_template(operations, template.get('params', []))
+            template_keys.append(template_key)
+            # Operations without a parameter draw a random key, so only templates
+            # whose keys all come from parameters can reuse earlier instances
+            cacheable.append(all(op.get('params') is not None for op in operations))
+        
+        prepared = self._prepared[benchmark_name] = (counts, template_keys, cacheable)
+        return prepared
+    
+    def generate_case(self, benchmark_name: str, templates: List[Dict], case_num: int, bench_workload_dir: Path) -> Path:
+        """
+        Generate and write one workload case for a benchmark
+        Returns: path of the written workload file
+        """
+        # Seed from (benchmark, case) for reproducible workloads whose RNG streams
+        # are independent across benchmarks as well as across cases
+        seed = self._seed(benchmark_name, case_num)
+        self.random = random.Random(seed)
+        self.rng = np.random.default_rng(seed) if np is not None else None
+        # _randbelow(n) + 1 draws the same values as randint(1, n) without its argument checks
+        self._randbelow = self.random._randbelow
+        
+        counts, template_keys, cacheable = self.prepare_benchmark(benchmark_name, templates)
+        
+        # Pre-draw the parameter values of every instance in one batch per template
+        param_rows = []
+        for template, count in zip(templates, counts):
+            num_params = len(template.get('params', []))
+            if self.rng is not None:
+                rows = self.rng.integers(1, self.max_key + 1, size=(count, num_params)).tolist()
+            else:
+                rows = [[self._randbelow(self.max_key) + 1 for _ in range(num_params)] for _ in range(count)]
+            param_rows.append(rows)
+        
+        # Shuffle a schedule of (template, instance) pairs up front, then instantiate
+        # transactions in that order while streaming them to disk
+        if self.rng is not None:
+            # One permutation of schedule indices in C instead of a Python-level shuffle
+            template_ids = np.repeat(np.arange(len(counts)), counts)
+            instances = np.concatenate([np.arange(1, count + 1) for count in counts])
+            perm = self.rng.permutation(len(template_ids))
+            schedule = zip(template_ids[perm].tolist(), instances[perm].tolist())
+        else:
+            schedule = []
+            for template_idx, count in enumerate(counts):
+                schedule.extend(zip(repeat(template_idx), range(1, count + 1)))
+            self.random.shuffle(schedule)
+        
+        # Save workload
+        output_file = bench_workload_dir / f"{benchmark_name}_{self.total_txns}t_{self.max_key}k_{case_num}.json"
+        
+        write_workload(output_file, (
+            self.instantiate_transaction(templates[template_idx], instance, param_rows[template_idx][instance - 1],
+                                         template_keys[template_idx], cacheable[template_idx])
+            for template_idx, instance in schedule
+        ), self.pretty)
+        
+        return output_file
+
+    def compile_java(self, project_dir: Path):
+        """Incrementally compile the Java project (no clean), continuing on failure"""
+        print(f"{CYAN}Compiling Java code...{NC}")
         try:
             result = subprocess.run(
-                ['mvn', 'clean', 'compile'],
+                ['mvn', '-q', 'compile'],
                 cwd=str(project_dir),
                 capture_output=True,
                 encoding='utf-8',
                 timeout=300
             )
             if result.returncode != 0:
-                error_msg = result.stderr
                 print(f"{RED}Warning: Maven compilation failed{NC}")
                 print(f"{YELLOW}Attempting to continue with existing build...{NC}")
             else:
@@ -133,6 +319,21 @@ class WorkloadGenerator:
             print(f"{YELLOW}Attempting to continue with existing build...{NC}")
         
         print()
+    
+    def generate_from_benchmarks(self, compile_java: bool = False, verbose: bool = False):
+        """Generate workloads from benchmark templates"""
+        project_dir = self.get_project_dir()
+        benchmark_dir = project_dir / 'data' / 'benchmarks'
+        bench_workload_dir = project_dir / 'data' / 'bench_workload'
+        
+        print("=" * 50)
+        print("Benchmark Workload Generator")
+        print("=" * 50)
+        print()
+        
+        # Workload generation does not need the Java build; compiling is opt-in
+        if compile_java:
+            self.compile_java(project_dir)
         
         if not benchmark_dir.exists():
             print(f"{RED}Error: Benchmark directory not found: {benchmark_dir}{NC}")
@@ -152,6 +353,7 @@ class WorkloadGenerator:
         print()
         
         total_generated = 0
+        benchmarks = []
         
         for benchmark_file in benchmark_files:
             benchmark_name = benchmark_file.stem
@@ -166,57 +368,61 @@ class WorkloadGenerator:
                     print(f"{YELLOW}Warning: No templates in {benchmark_name}{NC}")
                     continue
                 
-                # Generate workload for each case
-                for case_num in range(1, self.cases + 1):
-                    # Set seed for reproducible but distinct workloads across cases
-                    # Ensures consistent distribution regardless of when/how many times script is run
-                    self.random.seed(case_num)
-                    
-                    transactions = []
-                    
-                    # Instantiate each template according to its percentage
-                    for template in templates:
-                        name = template.get('name', 'unknown')
-                        isolation_level = template.get('isolationLevel', 'SERIALIZABLE')
-                        percentage = template.get('percentage', 0.05)
-                        operations = template.get('operations', [])
-                        params = template.get('params', [])  # Get parameter names
-                        
-                        # Generate instances based on percentage
-                        count = max(1, round(self.total_txns * percentage))
-                        
-                        for i in range(count):
-                            # Generate random parameter values for this instance
-                            param_values = {}
-                            for param_name in params:
-                                param_values[param_name] = self.random.randint(1, self.max_key)
-                            
-                            txn_name = f"{name}_{i + 1}"
-                            concrete_ops = self.instantiate_template(operations, param_values)
-                            
-                            transactions.append({
-                                'name': txn_name,
-                                'isolationLevel': isolation_level,
-                                'operations': concrete_ops
-                            })
-                    
-                    # Shuffle transactions
-                    self.random.shuffle(transactions)
-                    
-                    # Save workload
-                    workload = {'templates': transactions}
-                    output_file = bench_workload_dir / f"{benchmark_name}_{self.total_txns}t_{self.max_key}k_{case_num}.json"
-                    
-                    with open(output_file, 'w', encoding='utf-8') as f:
-                        json.dump(workload, f, indent=2)
-                    
-                    print(f"{GREEN}✓{NC} Generated {output_file.name}")
-                    total_generated += 1
+                # Compile once here so template errors surface before any case is queued;
+                # pool workers compile their own copy once and reuse it across cases
+                self.prepare_benchmark(benchmark_name, templates)
+                benchmarks.append((benchmark_name, templates))
                 
             except Exception as e:
                 print(f"{RED}✗{NC} Error processing {benchmark_name}: {e}")
                 return False
         
+        # Benchmarks are independent, so each one is a pool task that keeps its compiled
+        # templates and instantiation cache in one worker. Cases are only split into
+        # batches when there are fewer benchmarks than workers. Cases are seeded by
+        # (benchmark, case), so the output is identical to a sequential run.
+        generator_args = (self.total_txns, self.max_key, self.cases, self.pretty)
+        max_workers = max(1, min(os.cpu_count() or 4, len(benchmarks) * self.cases))
+        batches_per_benchmark = -(-max_workers // max(1, len(benchmarks)))
+        batch_size = -(-self.cases // batches_per_benchmark)
+        case_batches = [
+            list(range(start, min(start + batch_size, self.cases + 1)))
+            for start in range(1, self.cases + 1, batch_size)
+        ]
+        
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                (benchmark_name, executor.submit(_generate_benchmark, generator_args, benchmark_name,
+                                                 templates, case_nums, bench_workload_dir))
+                for benchmark_name, templates in benchmarks
+                for case_nums in case_batches
+            ]
+            
+            progress = None
+            if not verbose and tqdm is not None:
+                progress = tqdm(total=len(benchmarks) * self.cases, unit='case', mininterval=0.25)
+            
+            for benchmark_name, future in futures:
+                try:
+                    output_files = future.result()
+                except Exception as e:
+                    if progress is not None:
+                        progress.close()
+                    print(f"{RED}✗{NC} Error processing {benchmark_name}: {e}")
+                    executor.shutdown(wait=False, cancel_futures=True)
+                    return False
+                
+                if progress is not None:
+                    progress.set_description(benchmark_name, refresh=False)
+                    progress.update(len(output_files))
+                else:
+                    for output_file in output_files:
+                        print(f"{GREEN}✓{NC} Generated {output_file.name}")
+                total_generated += len(output_files)
+            
+            if progress is not None:
+                progress.close()
+        
         print()
         print("=" * 50)
         print("Generation Complete")
@@ -238,6 +444,9 @@ Examples:
   
   # Generate 20 workloads for benchmark
   python generate_bench_workload.py --txns 10000 --max-key 100 --cases 20
+  
+  # Also compile the Java project before generating
+  python generate_bench_workload.py --cases 20 --compile
         '''
     )
     
@@ -262,6 +471,24 @@ Examples:
         help='Number of different workload cases to generate (default: 20)'
     )
     
+    parser.add_argument(
+        '--compile',
+        action='store_true',
+        help='Run an incremental Maven compile before generating (default: off)'
+    )
+    
+    parser.add_argument(
+        '--pretty',
+        action='store_true',
+        help='Write 2-space indented JSON for human inspection (default: compact)'
+    )
+    
+    parser.add_argument(
+        '-v', '--verbose',
+        action='store_true',
+        help='Print a status line for every case instead of a progress bar'
+    )
+    
     args = parser.parse_args()
     
     # Validate arguments
@@ -280,9 +507,10 @@ Examples:
     generator = WorkloadGenerator(
         total_txns=args.txns,
         max_key=args.max_key,
-        cases=args.cases
+        cases=args.cases,
+        pretty=args.pretty
     )
-    success = generator.generate_from_benchmarks()
+    success = generator.generate_from_benchmarks(compile_java=args.compile, verbose=args.verbose)
     return 0 if success else 1
 
 if __name__ == '__main__':
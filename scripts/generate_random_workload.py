@@ -9,10 +9,25 @@ import os
 import sys
 import json
 import random
+import hashlib
 import argparse
+from array import array
 from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Tuple
+try:
+    import orjson
+except ImportError:
+    orjson = None
+try:
+    import numpy as np
+except ImportError:
+    np = None
+try:
+    from tqdm import tqdm
+except ImportError:
+    tqdm = None
 
 # Set UTF-8 encoding for Windows compatibility
 if sys.platform == 'win32':
@@ -25,10 +40,99 @@ YELLOW = '\033[1;33m'
 CYAN = '\033[0;36m'
 NC = '\033[0m'
 
+# Random operations are a fair choice between these two types, stored by their initials
+OP_TYPES = ('READ', 'WRITE')
+OP_CODES = b'RW'
+TYPE_NAMES = dict(zip(OP_CODES, OP_TYPES))
+
+# Transactions drawn per batch of numpy calls; bounds memory while streaming
+TXN_CHUNK = 65536
+
+class KeyNames(dict):
+    """key number -> 'key_{n}', formatted on first lookup and reused afterwards"""
+    
+    def __missing__(self, key_num: int) -> str:
+        name = self[key_num] = f'key_{key_num}'
+        return name
+
+class OperationColumns:
+    """
+    Operations of one transaction kept as parallel columns: implicit ids 1..n,
+    one type code per operation (b'R'/b'W') and integer key numbers.
+    The {'id', 'type', 'key'} dicts and key names are only built while the workload is serialized.
+    """
+    __slots__ = ('types', 'key_nums', 'key_names')
+    
+    def __init__(self, types, key_nums, key_names: KeyNames):
+        self.types = types
+        self.key_nums = key_nums
+        self.key_names = key_names
+    
+    def __len__(self) -> int:
+        return len(self.types)
+    
+    def to_dicts(self) -> List[Dict]:
+        """Materialize the operations in the workload JSON schema"""
+        key_names = self.key_names
+        return [
+            {'id': op_id, 'type': TYPE_NAMES[code], 'key': key_names[key_num]}
+            for op_id, (code, key_num) in enumerate(zip(self.types, self.key_nums), 1)
+        ]
+
+def _encode_default(obj):
+    """JSON encoder hook that expands OperationColumns into operation dicts"""
+    if isinstance(obj, OperationColumns):
+        return obj.to_dicts()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+# Stdlib encoders for when orjson is missing, built once rather than per json.dumps call
+COMPACT_ENCODER = json.JSONEncoder(separators=(',', ':'), default=_encode_default)
+PRETTY_ENCODER = json.JSONEncoder(indent=2, default=_encode_default)
+
+# Output files are written through a 1 MiB buffer to keep write() calls few
+WRITE_BUFFER_SIZE = 1 << 20
+
+def dump_transaction(txn: Dict[str, Any], pretty: bool = False) -> bytes:
+    """Encode one transaction as compact (or 2-space indented) JSON, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(txn, default=_encode_default, option=orjson.OPT_INDENT_2 if pretty else None)
+    return (PRETTY_ENCODER if pretty else COMPACT_ENCODER).encode(txn).encode('utf-8')
+
+def write_workload(output_file: Path, transactions: Iterable[Dict[str, Any]], pretty: bool = False) -> Tuple[int, int]:
+    """
+    Stream {"templates": [...]} to disk one transaction at a time, producing the same
+    bytes as dumping the whole workload at once (compact, or indented with pretty)
+    Returns: (transactions written, bytes written)
+    """
+    if pretty:
+        head, first_sep, sep, tail, empty_tail = b'{\n  "templates": [', b'\n    ', b',\n    ', b'\n  ]\n}', b']\n}'
+    else:
+        head, first_sep, sep, tail, empty_tail = b'{"templates":[', b'', b',', b']}', b']}'
+    
+    count = 0
+    size = len(head)
+    with open(output_file, 'wb', buffering=WRITE_BUFFER_SIZE) as f:
+        f.write(head)
+        for txn in transactions:
+            data = dump_transaction(txn, pretty)
+            if pretty:
+                data = data.replace(b'\n', b'\n    ')
+            size += f.write(sep if count else first_sep)
+            size += f.write(data)
+            count += 1
+        size += f.write(tail if count else empty_tail)
+    return count, size
+
+def _generate_case(generator_args, case_num, random_workload_dir):
+    """Worker entry point: generate one case in the pool process; generate_case seeds it"""
+    generator = RandomWorkloadGenerator(*generator_args)
+    return generator.generate_case(case_num, random_workload_dir)
+
 class RandomWorkloadGenerator:
     """Generate random KV operation workloads"""
     
-    def __init__(self, total_txns: int, max_ops: int, max_key: int, cases: int = 1, read_only_percent: int = 0):
+    def __init__(self, total_txns: int, max_ops: int, max_key: int, cases: int = 1, read_only_percent: int = 0,
+                 pretty: bool = False):
         """
         Initialize the random workload generator.
         
@@ -38,70 +142,113 @@ class RandomWorkloadGenerator:
             max_key: Maximum key ID (1 to max_key)
             cases: Number of different workload cases to generate
             read_only_percent: Percentage of read-only transactions (0-100)
+            pretty: Write 2-space indented JSON instead of compact JSON
         """
         self.total_txns = total_txns
         self.max_ops = max_ops
         self.max_key = max_key
         self.cases = cases
         self.read_only_percent = read_only_percent
+        self.pretty = pretty
         self.random = random.Random()
+        # Bound once for the pure-Python path: _randbelow(n) + 1 draws the same
+        # values as randint(1, n) without its argument checks
+        self._randbelow = self.random._randbelow
+        # Vectorized draws when numpy is available; self.random is the fallback
+        self.rng = np.random.default_rng() if np is not None else None
+        # key number -> "key_n", filled on first use and shared by all cases
+        self._key_cache = KeyNames()
         
+    @staticmethod
+    def _seed(*parts) -> int:
+        """Derive a deterministic 64-bit seed from the SHA-256 of the given parts"""
+        return int.from_bytes(hashlib.sha256(repr(parts).encode()).digest()[:8], 'big')
+    
+    def key_name(self, key_num: int) -> str:
+        """Return the cached 'key_{n}' string for a key number"""
+        return self._key_cache[key_num]
+    
     def get_project_dir(self) -> Path:
         """Get project root directory"""
         return Path(__file__).parent.parent.absolute()
     
-    def generate_read_only_operations(self) -> List[Dict]:
+    def generate_read_only_operations(self) -> OperationColumns:
         """Generate read-only operations for a transaction"""
-        num_ops = self.random.randint(1, self.max_ops)
-        operations = []
-        
-        for op_id in range(1, num_ops + 1):
-            key_num = self.random.randint(1, self.max_key)
-            operations.append({
-                'id': op_id,
-                'type': 'READ',
-                'key': f'key_{key_num}'
-            })
+        randbelow = self._randbelow
+        max_key = self.max_key
+        num_ops = randbelow(self.max_ops) + 1
+        key_nums = array('i', [randbelow(max_key) + 1 for _ in range(num_ops)])
         
-        return operations
+        return OperationColumns(OP_CODES[:1] * num_ops, key_nums, self._key_cache)
     
-    def generate_random_operations(self) -> List[Dict]:
+    def generate_random_operations(self) -> OperationColumns:
         """Generate random operations for a transaction"""
-        num_ops = self.random.randint(1, self.max_ops)
-        operations = []
+        randbelow = self._randbelow
+        max_key = self.max_key
+        num_ops = randbelow(self.max_ops) + 1
+        types = bytearray(num_ops)
+        key_nums = array('i', bytes(4 * num_ops))
         
-        for op_id in range(1, num_ops + 1):
-            op_type = self.random.choice(['READ', 'WRITE'])
-            key_num = self.random.randint(1, self.max_key)
-            
-            if op_type == 'UPDATE':
-                # UPDATE is represented as both READ and WRITE
-                operations.append({
-                    'id': op_id,
-                    'type': 'READ',
-                    'key': f'key_{key_num}'
-                })
-                operations.append({
-                    'id': op_id,
-                    'type': 'WRITE',
-                    'key': f'key_{key_num}'
-                })
-            else:
-                operations.append({
-                    'id': op_id,
-                    'type': op_type,
-                    'key': f'key_{key_num}'
-                })
+        for i in range(num_ops):
+            types[i] = OP_CODES[randbelow(2)]
+            key_nums[i] = randbelow(max_key) + 1
         
-        return operations
+        return OperationColumns(types, key_nums, self._key_cache)
     
-    def generate_transactions(self) -> List[Dict]:
-        """Generate random transactions"""
-        transactions = []
+    def generate_transactions_vectorized(self) -> Iterator[Dict]:
+        """
+        Generate random transactions from a handful of numpy draws per chunk of
+        TXN_CHUNK transactions (read-only flags, op counts, keys and op types)
+        instead of one call per value.
+        Operations stay as OperationColumns slices of the chunk columns until the workload is written.
+        """
+        rng = self.rng
+        # Transactions are i.i.d., so naming them by a random permutation is the
+        # same as shuffling the finished list
+        txn_ids = rng.permutation(self.total_txns) + 1
+        read_code, write_code = OP_CODES
+        read_only_p = self.read_only_percent / 100.0
+        
+        for chunk_start in range(0, self.total_txns, TXN_CHUNK):
+            chunk_ids = txn_ids[chunk_start:chunk_start + TXN_CHUNK]
+            size = len(chunk_ids)
+            # One Bernoulli draw per transaction for the whole chunk
+            read_only = rng.random(size) < read_only_p
+            num_ops = rng.integers(1, self.max_ops + 1, size=size)
+            ends = np.cumsum(num_ops)
+            total_ops = int(ends[-1])
+            
+            key_nums = rng.integers(1, self.max_key + 1, size=total_ops).tolist()
+            # Read-only transactions never write
+            is_write = (rng.integers(0, 2, size=total_ops) == 1) & ~np.repeat(read_only, num_ops)
+            types = np.where(is_write, write_code, read_code).astype(np.uint8).tobytes()
+            
+            start = 0
+            for txn_id, end in zip(chunk_ids.tolist(), ends.tolist()):
+                operations = OperationColumns(types[start:end], key_nums[start:end], self._key_cache)
+                start = end
+                
+                yield {
+                    'name': f'Txn_{txn_id}',
+                    'isolationLevel': 'SERIALIZABLE',
+                    'operations': operations
+                }
+    
+    def generate_transactions(self) -> Iterator[Dict]:
+        """Generate random transactions lazily, already in shuffled order"""
+        if self.rng is not None:
+            yield from self.generate_transactions_vectorized()
+            return
+        
+        txn_ids = list(range(1, self.total_txns + 1))
+        self.random.shuffle(txn_ids)
         
-        for txn_id in range(1, self.total_txns + 1):
+        read_only_p = self.read_only_percent / 100.0
+        uniform = self.random.random
+        
+        for txn_id in txn_ids:
             # Determine if this transaction should be read-only
-            is_read_only = self.random.randint(1, 100) <= self.read_only_percent
+            is_read_only = uniform() < read_only_p
             
             if is_read_only:
                 operations = self.generate_read_only_operations()
@@ -111,16 +258,37 @@ class RandomWorkloadGenerator:
             # Set isolation level to SERIALIZABLE
             isolation_level = 'SERIALIZABLE'
             
-            transactions.append({
+            yield {
                 'name': f'Txn_{txn_id}',
                 'isolationLevel': isolation_level,
                 'operations': operations
-            })
+            }
+    
+    def generate_case(self, case_num: int, random_workload_dir: Path):
+        """
+        Generate and write one random workload case
+        Returns: (output_file, transaction_count, output_bytes)
+        """
+        # Generate filename based on parameters
+        # Format: workload_{threads}t_{max_ops}o_{max_keys}k_{cases}r_{case_num}.json
+        max_key_str = f"{self.max_key}k" if self.max_key == 0 else f"{self.max_key}k"
+        filename = f"workload_{self.total_txns}t_{self.max_ops}o_{max_key_str}_{self.read_only_percent}r_{case_num}.json"
+        output_file = random_workload_dir / filename
         
-        return transactions
+        # Seed from (configuration, case) for reproducible workloads whose RNG
+        # streams are independent across configurations as well as across cases
+        seed = self._seed(self.total_txns, self.max_ops, self.max_key, self.read_only_percent, case_num)
+        self.random = random.Random(seed)
+        self._randbelow = self.random._randbelow
+        self.rng = np.random.default_rng(seed) if np is not None else None
+        
+        # Transactions are streamed to disk as they are generated
+        txn_count, output_bytes = write_workload(output_file, self.generate_transactions(), self.pretty)
+        
+        return output_file, txn_count, output_bytes
     
-    def generate_workloads(self):
-        """Generate random workloads"""
+    def generate_workloads(self, verbose: bool = False, jobs: Optional[int] = None):
+        """Generate random workloads, spreading the cases over up to jobs worker processes"""
         project_dir = self.get_project_dir()
         random_workload_dir = project_dir / 'data' / 'random_workload'
         
@@ -138,39 +306,49 @@ class RandomWorkloadGenerator:
         
         random_workload_dir.mkdir(parents=True, exist_ok=True)
         
-        # Generate filename based on parameters
-        # Format: workload_{threads}t_{max_ops}o_{max_keys}k_{cases}r_{case_num}.json
-        max_key_str = f"{self.max_key}k" if self.max_key == 0 else f"{self.max_key}k"
-        
         total_generated = 0
         
-        for case_num in range(1, self.cases + 1):
-            print(f"{CYAN}Generating case {case_num}/{self.cases}...{NC}")
-            
-            try:
-                transactions = self.generate_transactions()
-                
-                # Shuffle transactions
-                self.random.shuffle(transactions)
-                
-                # Create workload
-                workload = {'templates': transactions}
-                
-                # Generate filename
-                filename = f"workload_{self.total_txns}t_{self.max_ops}o_{max_key_str}_{self.read_only_percent}r_{case_num}.json"
-                output_file = random_workload_dir / filename
-                
-                with open(output_file, 'w', encoding='utf-8') as f:
-                    json.dump(workload, f, indent=2)
+        print(f"{CYAN}Generating {self.cases} case(s)...{NC}")
+        
+        case_nums = range(1, self.cases + 1)
+        if self.cases == 1:
+            results = map(lambda case_num: self.generate_case(case_num, random_workload_dir), case_nums)
+            executor = None
+        else:
+            generator_args = (self.total_txns, self.max_ops, self.max_key, self.cases, self.read_only_percent,
+                              self.pretty)
+            executor = ProcessPoolExecutor(max_workers=min(jobs or os.cpu_count() or 4, self.cases))
+            futures = [executor.submit(_generate_case, generator_args, case_num, random_workload_dir)
+                       for case_num in case_nums]
+            results = (future.result() for future in futures)
+        
+        progress = None
+        if not verbose and tqdm is not None and self.cases > 1:
+            progress = tqdm(total=self.cases, unit='case', mininterval=0.25)
+        
+        try:
+            for case_num in case_nums:
+                try:
+                    output_file, txn_count, output_bytes = next(results)
+                except Exception as e:
+                    if progress is not None:
+                        progress.close()
+                        progress = None
+                    print(f"{RED}✗{NC} Error generating case {case_num}: {e}")
+                    return False
                 
-                print(f"{GREEN}✓{NC} Generated {output_file.name}")
-                print(f"  - Transactions: {len(transactions)}")
-                print(f"  - Output size: {output_file.stat().st_size} bytes")
+                if progress is not None:
+                    progress.update()
+                else:
+                    print(f"{GREEN}✓{NC} Generated {output_file.name}")
+                    print(f"  - Transactions: {txn_count}")
+                    print(f"  - Output size: {output_bytes} bytes")
                 total_generated += 1
-                
-            except Exception as e:
-                print(f"{RED}✗{NC} Error generating case {case_num}: {e}")
-                return False
+        finally:
+            if progress is not None:
+                progress.close()
+            if executor is not None:
+                executor.shutdown(cancel_futures=True)
         
         print()
         print("=" * 60)
@@ -196,6 +374,9 @@ Examples:
   
   # Generate workloads with 30% read-only transactions
   python generate_random_workload.py --txns 500 --max-ops 10 --max-key 500000 --cases 5 --read-only 30
+  
+  # Generate several configurations in one process, reading them from stdin
+  echo '[{"txns": 100, "max_ops": 5, "max_key": 1000}, {"txns": 200, "max_ops": 5, "max_key": 1000}]' | python generate_random_workload.py --batch -
         '''
     )
     
@@ -234,39 +415,129 @@ Examples:
         help='Percentage of read-only transactions (0-100) (default: 0)'
     )
     
+    parser.add_argument(
+        '--pretty',
+        action='store_true',
+        help='Write 2-space indented JSON for human inspection (default: compact)'
+    )
+    
+    parser.add_argument(
+        '-v', '--verbose',
+        action='store_true',
+        help='Print a status line for every case instead of a progress bar'
+    )
+    
+    parser.add_argument(
+        '-j', '--jobs',
+        type=int,
+        default=None,
+        help='Number of worker processes for the cases (default: number of usable CPU cores)'
+    )
+    
+    parser.add_argument(
+        '--batch',
+        metavar='FILE',
+        help="Read a JSON list of configurations (objects with txns, max_ops, max_key, read_only, cases, jobs) "
+             "from FILE, or '-' for stdin, and generate them in this process, stopping at the first "
+             "failure. The last output line is a JSON list with each configuration's exit code "
+             "(null for configurations skipped after a failure)"
+    )
+    
     args = parser.parse_args()
     
+    if args.batch:
+        try:
+            if args.batch == '-':
+                configs = json.load(sys.stdin)
+            else:
+                with open(args.batch, 'r', encoding='utf-8') as f:
+                    configs = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"{RED}Error: cannot read batch configurations: {e}{NC}")
+            return 1
+        
+        if not isinstance(configs, list):
+            print(f"{RED}Error: batch input must be a JSON list of configurations{NC}")
+            return 1
+        
+        codes = run_batch(configs, pretty=args.pretty, verbose=args.verbose, jobs=args.jobs)
+        print(json.dumps(codes))
+        return 0 if all(code == 0 for code in codes) else 1
+    
+    return run(
+        txns=args.txns,
+        max_ops=args.max_ops,
+        max_key=args.max_key,
+        read_only=args.read_only,
+        cases=args.cases,
+        pretty=args.pretty,
+        verbose=args.verbose,
+        jobs=args.jobs
+    )
+
+def run(txns: int, max_ops: int, max_key: int, read_only: int = 0, cases: int = 1,
+        pretty: bool = False, verbose: bool = False, jobs: Optional[int] = None) -> int:
+    """
+    Validate the parameters and generate workloads in-process, as main() does for the command line
+    Returns: process exit code (0 on success)
+    """
     # Validate arguments
-    if args.txns <= 0:
+    if txns <= 0:
         print(f"{RED}Error: txns must be positive{NC}")
         return 1
     
-    if args.max_ops <= 0:
+    if max_ops <= 0:
         print(f"{RED}Error: max_ops must be positive{NC}")
         return 1
     
-    if args.max_key <= 0:
+    if max_key <= 0:
         print(f"{RED}Error: max_key must be positive{NC}")
         return 1
     
-    if args.cases <= 0:
+    if cases <= 0:
         print(f"{RED}Error: cases must be positive{NC}")
         return 1
     
-    if args.read_only < 0 or args.read_only > 100:
+    if read_only < 0 or read_only > 100:
         print(f"{RED}Error: read-only percentage must be between 0 and 100{NC}")
         return 1
     
+    if jobs is not None and jobs <= 0:
+        print(f"{RED}Error: jobs must be positive{NC}")
+        return 1
+    
     generator = RandomWorkloadGenerator(
-        total_txns=args.txns,
-        max_ops=args.max_ops,
-        max_key=args.max_key,
-        read_only_percent=args.read_only,
-        cases=args.cases,
+        total_txns=txns,
+        max_ops=max_ops,
+        max_key=max_key,
+        read_only_percent=read_only,
+        cases=cases,
+        pretty=pretty,
     )
     
-    success = generator.generate_workloads()
+    success = generator.generate_workloads(verbose=verbose, jobs=jobs)
     return 0 if success else 1
 
+def run_batch(configs: List[Dict[str, Any]], pretty: bool = False, verbose: bool = False,
+              jobs: Optional[int] = None) -> List[Optional[int]]:
+    """
+    Run several configurations back to back in this process, so numpy and the
+    worker pool setup are paid for once instead of once per configuration.
+    The batch stops at the first failing configuration.
+    Returns: list of exit codes, one per configuration (None for skipped ones)
+    """
+    codes = []
+    for index, config in enumerate(configs, 1):
+        print(f"{CYAN}Batch configuration {index}/{len(configs)}: {config}{NC}")
+        try:
+            code = run(**{'pretty': pretty, 'verbose': verbose, 'jobs': jobs, **config})
+        except TypeError as e:
+            print(f"{RED}Error: invalid batch configuration {config}: {e}{NC}")
+            code = 1
+        codes.append(code)
+        if code != 0:
+            break
+    return codes + [None] * (len(configs) - len(codes))
+
 if __name__ == '__main__':
     sys.exit(main())
@@ -8,13 +8,28 @@ keeping others constant.
 """
 
 import os
+import io
 import sys
 import csv
+import json
+import argparse
+import functools
+import contextlib
+import signal
 import subprocess
+import threading
+import time
+import multiprocessing
+import multiprocessing.connection
 import re
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, List, Tuple
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+import matplotlib
+# Plots are only written to disk, so skip interactive backend selection
+matplotlib.use('Agg')
 import matplotlib.pyplot as plt
 import numpy as np
 
@@ -29,19 +44,57 @@ YELLOW = '\033[1;33m'
 CYAN = '\033[0;36m'
 NC = '\033[0m'
 
+# workload_{txns}t_{max_ops}o_{max_key}k_{read_only}r_{case_num}.json
+# Example: workload_500t_10o_1k_50r_1.json
+_WORKLOAD_FN_RE = re.compile(r'^workload_(\d+)t_(\d+)o_(\d+)k_(\d+)r_\d+\.json')
+
+# In-process calls run in a forked copy of this process; without fork the
+# generator and allocator run as separate Python processes instead
+CAN_FORK = 'fork' in multiprocessing.get_all_start_methods()
+
+# Popen arguments that start a command as the leader of a new process group, so
+# a kill can take down the worker pools it starts as well
+if sys.platform == 'win32':
+    _NEW_PROCESS_GROUP = {'creationflags': subprocess.CREATE_NEW_PROCESS_GROUP}
+else:
+    _NEW_PROCESS_GROUP = {'start_new_session': True}
+
+# Figure reused by _render_plot across calls; it lives until the process exits
+_FIGURE = None
+_AXES = None
+
+@functools.lru_cache(maxsize=1)
 def get_project_dir() -> Path:
-    """Get the project root directory"""
+    """Get the project root directory (resolved once per process)"""
     script_dir = Path(__file__).parent.absolute()
     project_dir = script_dir.parent
     return project_dir
 
-def run_command(cmd: List[str], description: str = "") -> bool:
+# Absolute paths used by the helpers below, so nothing depends on the cwd
+_SCRIPTS_DIR = get_project_dir() / 'scripts'
+_GENERATOR_SCRIPT = _SCRIPTS_DIR / 'generate_random_workload.py'
+_ALLOCATOR_SCRIPT = _SCRIPTS_DIR / 'allocate_random_workload.py'
+_RANDOM_WORKLOAD_DIR = get_project_dir() / 'data' / 'random_workload'
+
+def generation_timeout(txns: int, max_ops: int) -> float:
+    """
+    Timeout for one generator call, scaled with the workload size so a hung
+    small run is noticed quickly while large runs still get enough time.
+    
+    Returns:
+        Timeout in seconds
+    """
+    return max(60, txns * max_ops / 50)
+
+def run_command(cmd: List[str], description: str = "", verbose: bool = False, timeout: float = 600) -> bool:
     """
     Run a command and report results.
     
     Args:
         cmd: Command to run as list of strings
         description: Description of what the command does
+        verbose: Let the command's stdout through to the terminal instead of discarding it
+        timeout: Seconds to wait before the command is killed
         
     Returns:
         True if successful, False otherwise
@@ -50,71 +103,358 @@ def run_command(cmd: List[str], description: str = "") -> bool:
         print(f"{CYAN}{description}{NC}")
     
     try:
-        result = subprocess.run(cmd, capture_output=True, text=True, encoding='utf-8', timeout=600)
-        if result.returncode != 0:
+        # Only stderr is reported, so stdout is never buffered here; long
+        # allocation runs would otherwise pile their whole log up in memory
+        proc = subprocess.Popen(cmd, stdout=None if verbose else subprocess.DEVNULL, stderr=subprocess.PIPE,
+                                text=True, encoding='utf-8', **_NEW_PROCESS_GROUP)
+        try:
+            _, stderr = proc.communicate(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            # subprocess.run would only kill the command itself and then wait
+            # on pipes its worker processes still hold, so kill the whole group
+            _kill_command(proc)
+            print(f"{RED}✗ Command timeout after {timeout:.0f}s{NC}")
+            return False
+        if proc.returncode != 0:
             print(f"{RED}✗ Command failed: {' '.join(cmd)}{NC}")
-            if result.stderr:
-                print(f"  Error: {result.stderr[:200]}")
+            if stderr:
+                print(f"  Error: {stderr[:200]}")
             return False
         return True
+    except Exception as e:
+        print(f"{RED}✗ Exception: {e}{NC}")
+        return False
+
+def _run_captured(run, kwargs: Dict, conn) -> None:
+    """
+    Child side of run_in_process: call run() with stdout captured and send
+    (exit code, output) back through conn.
+    """
+    # Lead a new process group so a timeout also takes down run()'s own workers
+    os.setsid()
+    
+    output = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(output):
+            returncode = run(**kwargs)
+    except Exception as e:
+        output.write(f"Exception: {e}")
+        returncode = 1
+    conn.send((returncode, output.getvalue()))
+    conn.close()
+
+def _kill_process_tree(proc) -> None:
+    """Kill a run_in_process child together with any processes it started"""
+    try:
+        os.killpg(proc.pid, signal.SIGKILL)
+    except ProcessLookupError:
+        # The child hasn't made its own group yet
+        proc.kill()
+    proc.join()
+
+def _kill_command(proc) -> Tuple[str, str]:
+    """
+    Kill a command started in its own process group together with everything
+    it started, and collect whatever output it wrote before dying.
+    
+    Returns:
+        Tuple of (stdout, stderr)
+    """
+    try:
+        if sys.platform == 'win32':
+            proc.kill()
+        else:
+            os.killpg(proc.pid, signal.SIGKILL)
+    except ProcessLookupError:
+        pass
+    
+    try:
+        return proc.communicate(timeout=5)
     except subprocess.TimeoutExpired:
-        print(f"{RED}✗ Command timeout{NC}")
+        # Descendants outside the group still hold the pipes; stop reading them
+        for pipe in (proc.stdout, proc.stderr):
+            if pipe:
+                pipe.close()
+        proc.wait()
+        return '', ''
+
+def _start_in_process(run, kwargs: Dict):
+    """
+    Fork a copy of this process that calls run(**kwargs).
+    
+    Returns:
+        Tuple of (child process, receiving end of its result pipe)
+    """
+    context = multiprocessing.get_context('fork')
+    receiver, sender = context.Pipe(duplex=False)
+    try:
+        proc = context.Process(target=_run_captured, args=(run, kwargs, sender))
+        proc.start()
+    except Exception:
+        receiver.close()
+        raise
+    finally:
+        sender.close()
+    return proc, receiver
+
+def _finish_in_process(run, proc, receiver) -> bool:
+    """
+    Collect the result of a child started by _start_in_process once its pipe
+    is readable, reporting a failure the way run_command does.
+    
+    Returns:
+        True if successful, False otherwise
+    """
+    try:
+        returncode, output = receiver.recv()
+    except EOFError:
+        # The child died before reporting back
+        proc.join()
+        returncode, output = 1, f"process exited with code {proc.exitcode}"
+    finally:
+        receiver.close()
+        proc.join()
+    
+    if returncode != 0:
+        print(f"{RED}✗ Call failed: {run.__module__}.run(){NC}")
+        error = output.strip()
+        if error:
+            print(f"  Error: {error[-200:]}")
         return False
+    return True
+
+def run_in_process(run, description: str = "", timeout: float = 600, **kwargs) -> bool:
+    """
+    Call a script's run() without starting a new Python interpreter, capturing
+    its output the way run_command does.
+    
+    The call runs in a forked copy of this process, so the already imported
+    modules are reused, yet a hung call can still be killed once the timeout
+    expires. This needs fork (see CAN_FORK); elsewhere callers use the
+    subprocess path, which is cheaper than a spawn that re-imports everything.
+    
+    Args:
+        run: The script's run() function, returning a process exit code
+        description: Description of what the call does
+        timeout: Seconds to wait before the call is killed
+        **kwargs: Arguments for run()
+        
+    Returns:
+        True if successful, False otherwise
+    """
+    if description:
+        print(f"{CYAN}{description}{NC}")
+    
+    try:
+        proc, receiver = _start_in_process(run, kwargs)
     except Exception as e:
         print(f"{RED}✗ Exception: {e}{NC}")
         return False
+    
+    if not receiver.poll(timeout):
+        receiver.close()
+        _kill_process_tree(proc)
+        print(f"{RED}✗ Call timeout after {timeout:.0f}s: {run.__module__}.run(){NC}")
+        return False
+    return _finish_in_process(run, proc, receiver)
 
-def generate_workload(txns: int, max_ops: int, max_key: int, read_only: int, cases: int) -> bool:
+def generate_workloads_in_process(configs: List[Dict], cases: int, jobs: Optional[int] = None,
+                                  workers: int = 1) -> List[Optional[bool]]:
     """
-    Generate random workload with specified parameters.
+    Generate several workload configurations by calling the generator in-process,
+    up to workers of them at a time.
+    
+    Every call is forked from this thread and the results are collected by
+    waiting on their pipes, so no other thread can hold a lock at fork time.
+    The first failure stops the rest: running calls are killed and the ones
+    not started yet are skipped.
     
     Args:
-        txns: Total number of transactions
-        max_ops: Maximum operations per transaction
-        max_key: Maximum key ID
-        read_only: Percentage of read-only transactions
-        cases: Number of workload cases to generate
+        configs: Parameter sets with txns, max_ops, max_key and read_only
+        cases: Number of workload cases to generate per configuration
+        jobs: Number of worker processes each call spreads its cases over
+        workers: Number of calls to run at once
         
     Returns:
-        True if successful, False otherwise
+        One success flag per configuration, None for those skipped or killed after a failure
     """
-    project_dir = get_project_dir()
-    script_path = project_dir / 'scripts' / 'generate_random_workload.py'
-    
-    cmd = [
-        sys.executable,
-        str(script_path),
-        '--txns', str(txns),
-        '--max-ops', str(max_ops),
-        '--max-key', str(max_key),
-        '--read-only', str(read_only),
-        '--cases', str(cases)
-    ]
+    import generate_random_workload
+    run = generate_random_workload.run
+    
+    results = [None] * len(configs)
+    pending = list(range(len(configs)))
+    running = {}
+    
+    while pending or running:
+        while pending and len(running) < workers:
+            index = pending.pop(0)
+            config = configs[index]
+            print(f"{CYAN}  Generating workload: txns={config['txns']}, max-ops={config['max_ops']}, "
+                  f"max-key={config['max_key']}, read-only={config['read_only']}%{NC}")
+            kwargs = {
+                'txns': config['txns'],
+                'max_ops': config['max_ops'],
+                'max_key': config['max_key'],
+                'read_only': config['read_only'],
+                'cases': cases,
+                'jobs': jobs,
+                'verbose': True
+            }
+            try:
+                proc, receiver = _start_in_process(run, kwargs)
+            except Exception as e:
+                print(f"{RED}✗ Exception: {e}{NC}")
+                results[index] = False
+                break
+            timeout = generation_timeout(config['txns'], config['max_ops'])
+            running[receiver] = (index, proc, timeout, time.monotonic() + timeout)
+        
+        for receiver in multiprocessing.connection.wait(list(running), timeout=0.5):
+            index, proc, _, _ = running.pop(receiver)
+            results[index] = _finish_in_process(run, proc, receiver)
+        
+        now = time.monotonic()
+        for receiver, (index, proc, timeout, deadline) in list(running.items()):
+            if now >= deadline:
+                del running[receiver]
+                receiver.close()
+                _kill_process_tree(proc)
+                print(f"{RED}✗ Call timeout after {timeout:.0f}s: {run.__module__}.run(){NC}")
+                results[index] = False
+        
+        if False in results:
+            # The first failure stops the rest of the configurations
+            for receiver, (_, proc, _, _) in running.items():
+                receiver.close()
+                _kill_process_tree(proc)
+            break
+    
+    return results
+
+def generate_workload_batch(configs: List[Dict], cases: int, jobs: Optional[int] = None,
+                            abort: Optional[threading.Event] = None) -> List[Optional[bool]]:
+    """
+    Generate several workload configurations with a single generator process.
+    The generator stops at the first failing configuration.
+    
+    Args:
+        configs: Parameter sets with txns, max_ops, max_key and read_only
+        cases: Number of workload cases to generate per configuration
+        jobs: Number of worker processes the generator spreads the cases over
+        abort: Event that, once set, kills the generator (its configurations count as skipped)
+        
+    Returns:
+        One success flag per configuration, None for those skipped after a failure
+    """
+    script_path = _GENERATOR_SCRIPT
     
-    return run_command(cmd, f"  Generating workload: txns={txns}, max-ops={max_ops}, max-key={max_key}, read-only={read_only}%")
+    payload = json.dumps([
+        {
+            'txns': config['txns'],
+            'max_ops': config['max_ops'],
+            'max_key': config['max_key'],
+            'read_only': config['read_only'],
+            'cases': cases,
+            'jobs': jobs,
+            'verbose': True
+        }
+        for config in configs
+    ])
+    cmd = [sys.executable, str(script_path), '--batch', '-']
+    timeout = sum(generation_timeout(config['txns'], config['max_ops']) for config in configs)
+    
+    print(f"{CYAN}  Generating {len(configs)} workload configurations in one process{NC}")
+    
+    try:
+        proc = subprocess.Popen(cmd, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                                text=True, encoding='utf-8', **_NEW_PROCESS_GROUP)
+    except Exception as e:
+        print(f"{RED}✗ Exception: {e}{NC}")
+        return [False] * len(configs)
+    
+    # Wait in short slices so a failure in a sibling batch can stop this one early
+    deadline = time.monotonic() + timeout
+    stdin_payload = payload
+    while True:
+        try:
+            stdout, stderr = proc.communicate(input=stdin_payload, timeout=0.5)
+            break
+        except subprocess.TimeoutExpired:
+            # The payload is sent on the first call; retries must not pass it again
+            stdin_payload = None
+            if abort is not None and abort.is_set():
+                # The generator's case pool would outlive a plain kill and keep
+                # the pipes open, so the whole group goes
+                _kill_command(proc)
+                return [None] * len(configs)
+            if time.monotonic() > deadline:
+                _kill_command(proc)
+                print(f"{RED}✗ Command timeout after {timeout:.0f}s{NC}")
+                return [False] * len(configs)
+    
+    # The generator reports each configuration's exit code on its last output line
+    lines = stdout.strip().splitlines()
+    try:
+        codes = json.loads(lines[-1])
+    except (IndexError, ValueError):
+        codes = None
+    
+    if not isinstance(codes, list) or len(codes) != len(configs):
+        print(f"{RED}✗ Command failed: {' '.join(cmd)}{NC}")
+        error = stderr or stdout
+        if error:
+            print(f"  Error: {error[-200:]}")
+        return [False] * len(configs)
+    
+    if proc.returncode != 0:
+        # The batch stopped at the failing configuration, so its error is the
+        # output after the last configuration header, before the exit code line
+        print(f"{RED}✗ Call failed: generate_random_workload.run(){NC}")
+        output = '\n'.join(lines[:-1]).rpartition('Batch configuration ')[2].partition('\n')[2]
+        error = (stderr or output).strip()
+        if error:
+            print(f"  Error: {error[-200:]}")
+    
+    return [None if code is None else code == 0 for code in codes]
 
-def run_allocation() -> bool:
+def run_allocation(use_subprocess: bool = not CAN_FORK) -> bool:
     """
     Run allocation on all generated workload files.
     
+    Args:
+        use_subprocess: Run the allocation script in its own Python process
+            (the default where fork is unavailable)
+        
     Returns:
         True if successful, False otherwise
     """
-    project_dir = get_project_dir()
-    script_path = project_dir / 'scripts' / 'allocate_random_workload.py'
+    if not use_subprocess:
+        import allocate_random_workload
+        return run_in_process(allocate_random_workload.run, "  Running allocation...")
+    
+    script_path = _ALLOCATOR_SCRIPT
     
     cmd = [sys.executable, str(script_path)]
     
     return run_command(cmd, "  Running allocation...")
 
+def remove_workload_files(params: Dict) -> None:
+    """Remove the workload files generated for one parameter set"""
+    pattern = f"workload_{params['txns']}t_{params['max_ops']}o_{params['max_key']}k_{params['read_only']}r_*.json"
+    for file in _RANDOM_WORKLOAD_DIR.glob(pattern):
+        file.unlink()
+
 def clean_random_workload_dir() -> None:
     """Clean the random workload directory"""
-    project_dir = get_project_dir()
-    workload_dir = project_dir / 'data' / 'random_workload'
+    workload_dir = _RANDOM_WORKLOAD_DIR
     
     if workload_dir.exists():
-        for file in workload_dir.glob('*.json'):
-            file.unlink()
+        # scandir + os.unlink avoids building a Path per file; only the .json
+        # workloads go, anything else in the directory is left alone
+        with os.scandir(workload_dir) as entries:
+            for entry in entries:
+                if entry.name.endswith('.json') and entry.is_file():
+                    os.unlink(entry.path)
 
 def parse_csv_by_params(csv_file: Path) -> Dict[str, Dict[str, List[float]]]:
     """
@@ -137,52 +477,83 @@ def parse_csv_by_params(csv_file: Path) -> Dict[str, Dict[str, List[float]]]:
         return result
     
     try:
+        import pandas as pd
+    except ImportError:
+        pd = None
+    
+    try:
+        if pd is not None:
+            # Vectorized path: filter, extract the parameters and group in C
+            df = pd.read_csv(csv_file, usecols=['filename', 'status', 'execution_time_seconds'])
+            df = df[df['status'] == 'success']
+            params = df['filename'].str.extract(_WORKLOAD_FN_RE)
+            params.columns = ['txns', 'max-ops', 'max-key', 'read-only']
+            matched = params.notna().all(axis=1)
+            params = params[matched].astype(int)
+            times = df.loc[matched, 'execution_time_seconds'].astype(float)
+            
+            for param in result:
+                grouped = times.groupby(params[param].values).agg(list)
+                result[param] = {int(value): group for value, group in grouped.items()}
+            return result
+        
+        # One defaultdict per parameter, bound to locals for the row loop
+        txns_times, ops_times, key_times = (defaultdict(list) for _ in range(3))
+        
         with open(csv_file, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
+            # Plain rows with column indices looked up once from the header,
+            # rather than a dict per row from DictReader
+            reader = csv.reader(f)
+            header = next(reader, None)
+            if not header:
+                return result
+            status_col = header.index('status')
+            filename_col = header.index('filename')
+            time_col = header.index('execution_time_seconds')
+            
             for row in reader:
-                if row['status'] != 'success':
+                if row[status_col] != 'success':
                     continue
                 
-                filename = row['filename']
-                execution_time = float(row['execution_time_seconds'])
+                filename = row[filename_col]
+                execution_time = float(row[time_col])
                 
-                # Parse filename: workload_{txns}t_{max_ops}o_{max_key}k_{read_only}r_{case_num}.json
-                # Example: workload_500t_10o_1k_50r_1.json
-                match = re.match(
-                    r'workload_(\d+)t_(\d+)o_(\d+)k_(\d+)r_\d+\.json',
-                    filename
-                )
+                # Parse filename parameters (see _WORKLOAD_FN_RE)
+                match = _WORKLOAD_FN_RE.match(filename)
                 
                 if match:
                     txns, max_ops, max_key, read_only = map(int, match.groups())
                     
                     # Group by parameter
-                    if txns not in result['txns']:
-                        result['txns'][txns] = []
-                    result['txns'][txns].append(execution_time)
-                    
-                    if max_ops not in result['max-ops']:
-                        result['max-ops'][max_ops] = []
-                    result['max-ops'][max_ops].append(execution_time)
-                    
-                    if max_key not in result['max-key']:
-                        result['max-key'][max_key] = []
-                    result['max-key'][max_key].append(execution_time)
+                    txns_times[txns].append(execution_time)
+                    ops_times[max_ops].append(execution_time)
+                    key_times[max_key].append(execution_time)
+        
+        result['txns'] = dict(txns_times)
+        result['max-ops'] = dict(ops_times)
+        result['max-key'] = dict(key_times)
     
     except Exception as e:
         print(f"{RED}Error parsing CSV: {e}{NC}")
     
     return result
 
-def create_plots(csv_file: Path) -> None:
-    """Create visualization plots for the experiment results"""
+def _render_plot(data: Dict[str, Dict[int, List[float]]], output_file: Path) -> None:
+    """Build the parameter figure from parsed results and save it to output_file"""
     
-    print(f"\n{CYAN}Creating visualization plots...{NC}")
-    
-    data = parse_csv_by_params(csv_file)
+    global _FIGURE, _AXES
     
-    # Create a figure with 3 subplots in a row
-    fig, axes = plt.subplots(1, 3, figsize=(18, 5))
+    # Create the figure with 3 subplots in a row once, then clear and reuse it
+    # on later calls instead of rebuilding the whole artist tree
+    if _FIGURE is None:
+        _FIGURE, _AXES = plt.subplots(1, 3, figsize=(18, 5))
+    else:
+        for ax in _AXES:
+            ax.cla()
+            # cla() keeps tick_params settings, so undo the label rotation a
+            # previous render may have applied
+            ax.tick_params(axis='x', labelrotation=0)
+    fig, axes = _FIGURE, _AXES
     fig.suptitle('Allocation Performance vs Workload Parameters', fontsize=16, fontweight='bold')
     
     # Helper function to plot a parameter
@@ -193,19 +564,28 @@ def create_plots(csv_file: Path) -> None:
             return
         
         # Sort by parameter value
-        sorted_items = sorted(param_data.items(), key=lambda x: x[0])
-        x_values = [str(x[0]) for x in sorted_items]
-        y_means = [np.mean(y) for _, y in sorted_items]
-        y_stds = [np.std(y) if len(y) > 1 else 0 for _, y in sorted_items]
+        keys = sorted(param_data)
+        x_values = [str(key) for key in keys]
+        
+        # Flatten the groups into one array so mean/std are a couple of
+        # bincount passes instead of a numpy call per group
+        counts = np.array([len(param_data[key]) for key in keys])
+        times = np.concatenate([param_data[key] for key in keys])
+        groups = np.repeat(np.arange(len(keys)), counts)
+        y_means = np.bincount(groups, weights=times, minlength=len(keys)) / counts
+        y_stds = np.sqrt(np.bincount(groups, weights=(times - y_means[groups]) ** 2, minlength=len(keys)) / counts)
         
-        # Plot with error bars
-        x_pos = np.arange(len(x_values))
-        ax.bar(x_pos, y_means, yerr=y_stds, capsize=5, color='steelblue', alpha=0.7)
+        # Plot with error bars; string x values give a categorical axis, so
+        # matplotlib places the bars and tick labels itself
+        bars = ax.bar(x_values, y_means, yerr=y_stds, capsize=5, color='steelblue', alpha=0.7)
+        # Bar bodies don't need vector precision; keep axes and labels vector
+        for bar in bars:
+            bar.set_rasterized(True)
         ax.set_xlabel(param_label)
         ax.set_ylabel('Execution Time (seconds)')
         ax.set_title(f'Performance vs {param_name}')
-        ax.set_xticks(x_pos)
-        ax.set_xticklabels(x_values, rotation=45, ha='right')
+        ax.tick_params(axis='x', labelrotation=45)
+        plt.setp(ax.get_xticklabels(), ha='right')
         ax.grid(axis='y', alpha=0.3)
     
     # Plot each parameter
@@ -213,22 +593,60 @@ def create_plots(csv_file: Path) -> None:
     plot_parameter(axes[1], 'max-ops', data['max-ops'], 'Max Operations per Txn')
     plot_parameter(axes[2], 'max-key', data['max-key'], 'Max Key ID')
     
-    plt.tight_layout()
-    
-    # Save the plot
-    project_dir = get_project_dir()
-    output_file = project_dir / 'data' / 'allocation_performance.png'
-    output_file.parent.mkdir(parents=True, exist_ok=True)
+    fig.tight_layout()
     
     try:
-        plt.savefig(output_file, dpi=300, bbox_inches='tight')
+        fig.savefig(output_file, dpi=150, bbox_inches='tight')
         print(f"{GREEN}✓ Plot saved to {output_file}{NC}")
     except Exception as e:
         print(f"{RED}Error saving plot: {e}{NC}")
-    finally:
-        plt.close()
 
-def run_experiment(name: str, base_params: Dict, varying_param: str, param_values: List[int], cases: int = 5) -> bool:
+def create_plots(csv_file: Path, background: bool = False,
+                 data: Optional[Dict[str, Dict[int, List[float]]]] = None,
+                 force: bool = False) -> Optional[Future]:
+    """Create visualization plots for the experiment results
+    
+    With background=True the figure is rendered and saved in a separate
+    process so the caller can carry on with the next sweep. Callers that
+    already hold the parse_csv_by_params() result can pass it as data so
+    the CSV is not read again. Nothing is done when the saved plot is
+    already newer than the CSV, unless force=True.
+    
+    Returns:
+        Future for the background render, or None when rendered inline
+    """
+    
+    print(f"\n{CYAN}Creating visualization plots...{NC}")
+    
+    project_dir = get_project_dir()
+    output_file = project_dir / 'data' / 'allocation_performance.png'
+    
+    # The plot only depends on the CSV, so skip parsing and rendering when
+    # the PNG was written after the CSV last changed
+    if (not force and output_file.exists() and csv_file.exists()
+            and output_file.stat().st_mtime_ns >= csv_file.stat().st_mtime_ns):
+        print(f"{GREEN}✓ Plot up to date, skipping: {output_file}{NC}")
+        return None
+    
+    if data is None:
+        data = parse_csv_by_params(csv_file)
+    
+    # Save the plot
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    
+    if not background:
+        _render_plot(data, output_file)
+        return None
+    
+    # matplotlib is not thread-safe, so render in a spawned process; the worker
+    # is joined at interpreter exit, not here
+    executor = ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context('spawn'))
+    future = executor.submit(_render_plot, data, output_file)
+    executor.shutdown(wait=False)
+    return future
+
+def run_experiment(name: str, base_params: Dict, varying_param: str, param_values: List[int], cases: int = 5,
+                   use_subprocess: bool = not CAN_FORK) -> bool:
     """
     Run a single sub-experiment with one varying parameter.
     
@@ -238,6 +656,8 @@ def run_experiment(name: str, base_params: Dict, varying_param: str, param_value
         varying_param: Name of the parameter to vary
         param_values: List of values for the varying parameter
         cases: Number of workload cases per configuration
+        use_subprocess: Run the experiment's generator calls in batched Python processes instead of
+            forked in-process calls (the default where fork is unavailable)
         
     Returns:
         True if successful, False otherwise
@@ -250,31 +670,90 @@ def run_experiment(name: str, base_params: Dict, varying_param: str, param_value
     print(f"Values to test: {param_values}")
     print()
     
+    work = []
     for value in param_values:
         params = base_params.copy()
         params[varying_param] = value
+        work.append((value, params))
+    
+    failed = []
+    
+    def report(value, success):
+        if success:
+            print(f"{GREEN}✓{NC} {CYAN}[{varying_param}={value}]{NC} generated")
+        else:
+            print(f"{RED}✗ Failed to generate workload for {varying_param}={value}{NC}")
+            failed.append(value)
+    
+    # The values run concurrently, one call per core, and each call spreads its
+    # cases over an equal share of the cores, so the sweep keeps about one
+    # process per core in total
+    cpu_count = os.cpu_count() or 4
+    workers = max(1, min(len(work), cpu_count))
+    jobs = max(1, cpu_count // workers)
+    
+    if not use_subprocess:
+        results = generate_workloads_in_process([params for _, params in work], cases, jobs=jobs, workers=workers)
+    else:
+        # The values are spread over one batched generator process per worker,
+        # so the interpreter and numpy start-up is paid once per batch rather
+        # than once per value. Striding mixes small and large values in each
+        # batch to even out their run time.
+        batches = [list(range(start, len(work), workers)) for start in range(workers)]
         
-        print(f"{CYAN}[{varying_param}={value}]{NC}")
-        
-        # Generate workload
-        if not generate_workload(
-            txns=params['txns'],
-            max_ops=params['max_ops'],
-            max_key=params['max_key'],
-            read_only=params['read_only'],
-            cases=cases
-        ):
-            print(f"{RED}✗ Failed to generate workload{NC}")
-            return False
-        
-        print()
+        # The first failure stops the sweep: each batch stops at its own
+        # failure and the abort event kills the others
+        abort = threading.Event()
+        results = [None] * len(work)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(generate_workload_batch, [work[index][1] for index in batch], cases, jobs, abort): batch
+                for batch in batches
+            }
+            
+            for future in as_completed(futures):
+                for index, success in zip(futures[future], future.result()):
+                    results[index] = success
+                if False in results:
+                    abort.set()
+    
+    skipped = []
+    for (value, _), success in zip(work, results):
+        if success is None:
+            skipped.append(value)
+        else:
+            report(value, success)
+    
+    if skipped:
+        print(f"{YELLOW}Skipping remaining values: {skipped}{NC}")
+        # A killed call may have been part-way through writing a workload
+        for value, params in work:
+            if value in skipped:
+                remove_workload_files(params)
+    
+    # Likewise a call killed on timeout; nothing a failed value wrote is usable
+    for value, params in work:
+        if value in failed:
+            remove_workload_files(params)
     
-    return True
+    print()
+    
+    return not failed
 
 def main():
     """Main execution"""
-    project_dir = get_project_dir()
-    os.chdir(project_dir)
+    parser = argparse.ArgumentParser(
+        description='Explore how workload parameters affect allocation performance'
+    )
+    
+    parser.add_argument(
+        '--subprocess',
+        action='store_true',
+        help='Run the generator in batched Python processes instead of forked in-process calls; '
+             'always the case where fork is unavailable'
+    )
+    
+    args = parser.parse_args()
     
     print("=" * 60)
     print("Allocation Random Performance Experiment")
@@ -332,7 +811,8 @@ def main():
             base_params=base_params,
             varying_param=exp['varying_param'],
             param_values=exp['values'],
-            cases=cases
+            cases=cases,
+            use_subprocess=args.subprocess or not CAN_FORK
         ):
             print(f"{RED}✗ Experiment failed: {exp['name']}{NC}")
             all_success = False
@@ -344,7 +824,7 @@ def main():
     print("Experiment Summary")
     print("=" * 60)
     
-    random_workload_dir = project_dir / 'data' / 'random_workload'
+    random_workload_dir = _RANDOM_WORKLOAD_DIR
     if random_workload_dir.exists():
         workload_files = list(random_workload_dir.glob('*.json'))
         print(f"{GREEN}✓ Workload generation completed{NC}")
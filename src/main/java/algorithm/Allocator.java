@@ -7,9 +7,11 @@ import model.IsolationLevel;
 import model.ProgramInstance;
 import model.TemplateSet;
 
+import java.io.BufferedReader;
 import java.io.FileWriter;
 import java.io.IOException;
 import java.io.PrintWriter;
+import java.nio.charset.StandardCharsets;
 import java.nio.file.Files;
 import java.nio.file.Path;
 import java.nio.file.Paths;
@@ -17,6 +19,10 @@ import java.util.List;
 import java.util.stream.Collectors;
 
 public class Allocator {
+	// Both are thread-safe once configured, so they are shared across files
+	private static final ObjectMapper MAPPER = new ObjectMapper();
+	private static final Gson GSON = new GsonBuilder().setPrettyPrinting().create();
+
 	public static List<ProgramInstance> allocate(List<ProgramInstance> templates) {
 		return templates.stream().map(template -> {
 			if (template.isWriteOnly() || template.isSingleRead()) {
@@ -54,10 +60,12 @@ public class Allocator {
 			System.err.println("Usage:");
 			System.err.println("  Mode 1 - Benchmark:     Allocator benchmark <workload_file> <output_csv> [warmups] [iterations]");
 			System.err.println("  Mode 2 - Allocate:      Allocator allocate <input_workload> <output_workload>");
+			System.err.println("  Mode 3 - Batch:         Allocator allocate-batch <manifest_file>");
 			System.err.println("");
 			System.err.println("Examples:");
 			System.err.println("  Allocator benchmark data/workload/workload_100t_5o_50k_50r_1.json results.csv 3 10");
 			System.err.println("  Allocator allocate data/bench_workload/SmallBank-1.json data/allocated_bench_workload/SmallBank-1-allocated.json");
+			System.err.println("  Allocator allocate-batch manifest.txt   (one <input_workload>\\t<output_workload> pair per line)");
 			return;
 		}
 
@@ -82,9 +90,11 @@ public class Allocator {
 				String inputFile = args[1];
 				String outputFile = args[2];
 				allocateAndSave(inputFile, outputFile);
+			} else if (mode.equals("allocate-batch")) {
+				allocateBatch(args[1]);
 			} else {
 				System.err.println("Unknown mode: " + mode);
-				System.err.println("Supported modes: benchmark, allocate");
+				System.err.println("Supported modes: benchmark, allocate, allocate-batch");
 			}
 		} catch (Exception e) {
 			System.err.println("Error during execution: " + e.getMessage());
@@ -108,33 +118,73 @@ public class Allocator {
 			return;
 		}
 
+		int allocatedCount = allocateFile(inputPath, Paths.get(outputFile));
+		if (allocatedCount == 0) {
+			System.err.println("No templates found in: " + inputFile);
+			return;
+		}
+
+		System.out.println("Allocation completed successfully.");
+		System.out.println("  Input:  " + inputFile);
+		System.out.println("  Output: " + outputFile);
+		System.out.println("  Allocated " + allocatedCount + " templates");
+	}
+
+	/**
+	 * Allocates every workload listed in a manifest within this single JVM, printing one
+	 * {@code OK <elapsed_ms>} or {@code ERR <message>} line per entry.
+	 *
+	 * @param manifestFile path to a file with one {@code <input_workload>\t<output_workload>} pair per line
+	 * @throws IOException if the manifest cannot be read
+	 */
+	private static void allocateBatch(String manifestFile) throws IOException {
+		Path manifestPath = Paths.get(manifestFile);
+		if (!Files.exists(manifestPath)) {
+			System.err.println("Manifest file does not exist: " + manifestFile);
+			return;
+		}
+
+		int failed;
+		try (BufferedReader reader = Files.newBufferedReader(manifestPath, StandardCharsets.UTF_8)) {
+			failed = AllocatorServer.serve(reader, System.out);
+		}
+
+		if (failed > 0) {
+			System.err.println(failed + " workload(s) in " + manifestFile + " failed to allocate");
+			System.exit(1);
+		}
+	}
+
+	/**
+	 * Applies the allocation algorithm to a workload file and writes the result to JSON
+	 * without reporting anything on stdout, so that it can also back {@link AllocatorServer}.
+	 *
+	 * @param inputPath  path to input workload JSON file
+	 * @param outputPath path to output allocated workload JSON file
+	 * @return number of allocated templates, or 0 if the input contains no templates
+	 * @throws IOException if file operations fail
+	 */
+	static int allocateFile(Path inputPath, Path outputPath) throws IOException {
 		// Parse JSON to TemplateSet
-		ObjectMapper mapper = new ObjectMapper();
-		TemplateSet templateSet = mapper.readValue(inputPath.toFile(), TemplateSet.class);
+		TemplateSet templateSet = MAPPER.readValue(inputPath.toFile(), TemplateSet.class);
 		List<ProgramInstance> templates = templateSet.getTemplates();
 
 		if (templates == null || templates.isEmpty()) {
-			System.err.println("No templates found in: " + inputFile);
-			return;
+			return 0;
 		}
 
 		// Apply allocation algorithm
 		List<ProgramInstance> allocatedTemplates = allocate(templates);
 
 		// Create output directory if it doesn't exist
-		Path outputPath = Paths.get(outputFile);
 		Files.createDirectories(outputPath.getParent());
 
 		// Save allocated workload to JSON file
 		TemplateSet allocatedSet = new TemplateSet(allocatedTemplates);
-		Gson gson = new GsonBuilder().setPrettyPrinting().create();
-		String jsonString = gson.toJson(allocatedSet);
+		String jsonString = GSON.toJson(allocatedSet);
 		Files.write(outputPath, jsonString.getBytes());
 
-		System.out.println("Allocation completed successfully.");
-		System.out.println("  Input:  " + inputFile);
-		System.out.println("  Output: " + outputFile);
-		System.out.println("  Allocated " + allocatedTemplates.size() + " templates");
+		return allocatedTemplates.size();
 	}
 
 	private static void benchmark(String workloadFile, String outputCsv, int warmups, int iterations) throws IOException {
@@ -146,8 +196,7 @@ public class Allocator {
 
 		WorkloadParams params = parseParamsFromFilename(inputPath.getFileName().toString());
 
-		ObjectMapper mapper = new ObjectMapper();
-		TemplateSet templateSet = mapper.readValue(inputPath.toFile(), TemplateSet.class);
+		TemplateSet templateSet = MAPPER.readValue(inputPath.toFile(), TemplateSet.class);
 		List<ProgramInstance> templates = templateSet.getTemplates();
 
 		for (int i = 0; i < warmups; i++) {
@@ -0,0 +1,80 @@
+package algorithm;
+
+import java.io.BufferedReader;
+import java.io.FileDescriptor;
+import java.io.FileOutputStream;
+import java.io.IOException;
+import java.io.InputStreamReader;
+import java.io.PrintStream;
+import java.nio.charset.StandardCharsets;
+import java.nio.file.Files;
+import java.nio.file.Path;
+import java.nio.file.Paths;
+import java.util.Locale;
+
+/**
+ * Long-lived allocation worker that keeps one JVM warm across many workload files.
+ * <p>
+ * Reads one job per line from stdin as {@code <input_workload>\t<output_workload>} and
+ * answers each with a single line on stdout: {@code OK <elapsed_ms>} or {@code ERR <message>}.
+ * The worker exits once stdin is closed.
+ */
+public class AllocatorServer {
+	public static void main(String[] args) throws IOException {
+		// Keep the protocol channel clean: anything else printed to stdout goes to stderr
+		PrintStream out = new PrintStream(new FileOutputStream(FileDescriptor.out), true, "UTF-8");
+		System.setOut(System.err);
+
+		BufferedReader in = new BufferedReader(new InputStreamReader(System.in, StandardCharsets.UTF_8));
+		serve(in, out);
+	}
+
+	/**
+	 * Processes jobs from {@code in} until end of stream, writing one reply line per job.
+	 *
+	 * @param in  source of {@code <input_workload>\t<output_workload>} lines
+	 * @param out destination of the {@code OK}/{@code ERR} reply lines
+	 * @return number of jobs answered with {@code ERR}
+	 * @throws IOException if reading a job fails
+	 */
+	static int serve(BufferedReader in, PrintStream out) throws IOException {
+		int failed = 0;
+		String line;
+		while ((line = in.readLine()) != null) {
+			if (line.isEmpty()) {
+				continue;
+			}
+			String reply = handle(line);
+			if (reply.startsWith("ERR")) {
+				failed++;
+			}
+			out.println(reply);
+			out.flush();
+		}
+		return failed;
+	}
+
+	private static String handle(String line) {
+		String[] job = line.split("\t", -1);
+		if (job.length != 2) {
+			return "ERR Malformed job, expected <input_workload>\\t<output_workload>: " + line;
+		}
+
+		long start = System.nanoTime();
+		try {
+			Path inputPath = Paths.get(job[0]);
+			if (!Files.exists(inputPath)) {
+				return "ERR Input file does not exist: " + job[0];
+			}
+			if (Allocator.allocateFile(inputPath, Paths.get(job[1])) == 0) {
+				return "ERR No templates found in: " + job[0];
+			}
+			double elapsedMs = (System.nanoTime() - start) / 1_000_000.0;
+			return String.format(Locale.ROOT, "OK %.3f", elapsedMs);
+		} catch (Exception e) {
+			String message = e.getMessage() != null ? e.getMessage() : e.toString();
+			// Replies are line-delimited, so multi-line messages are flattened
+			return "ERR " + message.replaceAll("\\s*[\\r\\n]+\\s*", " ");
+		}
+	}
+}
@@ -0,0 +1,66 @@
+"""
+Tests for scripts/random_workload_for_test.py.
+Run from the project root with: python -m unittest discover tests
+"""
+
+import sys
+import shutil
+import tempfile
+import threading
+import unittest
+from unittest import mock
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent / 'scripts'
+
+
+class RunExperimentTest(unittest.TestCase):
+    def setUp(self):
+        # Work on a copy of the scripts, so generated workloads land in a
+        # scratch project directory instead of the real data/ tree
+        self.project_dir = Path(tempfile.mkdtemp())
+        shutil.copytree(SCRIPTS_DIR, self.project_dir / 'scripts')
+        sys.path.insert(0, str(self.project_dir / 'scripts'))
+        for name in ('random_workload_for_test', 'generate_random_workload'):
+            sys.modules.pop(name, None)
+        import random_workload_for_test
+        self.module = random_workload_for_test
+
+    def tearDown(self):
+        sys.path.remove(str(self.project_dir / 'scripts'))
+        for name in ('random_workload_for_test', 'generate_random_workload'):
+            sys.modules.pop(name, None)
+        shutil.rmtree(self.project_dir, ignore_errors=True)
+
+    def _run_failing_sweep(self, use_subprocess):
+        outcome = {}
+
+        def sweep():
+            outcome['success'] = self.module.run_experiment(
+                'failing value', {'txns': 20000, 'max_ops': 10, 'max_key': 100, 'read_only': 10},
+                'txns', [20000, 20001, -1, 20002, 20003, 20004], cases=4, use_subprocess=use_subprocess
+            )
+
+        with mock.patch.object(self.module.os, 'cpu_count', return_value=3):
+            thread = threading.Thread(target=sweep, daemon=True)
+            thread.start()
+            thread.join(120)
+
+        self.assertFalse(thread.is_alive(), 'sweep did not return after a failed value')
+        self.assertFalse(outcome['success'])
+        workload_dir = self.project_dir / 'data' / 'random_workload'
+        self.assertFalse(workload_dir.exists() and any(workload_dir.glob('workload_-1t_*')))
+
+    def test_failing_value_stops_multi_batch_sweep(self):
+        # Three concurrent batches with several cases each, so every generator
+        # runs its own case pool; the invalid value must abort the siblings
+        # without leaving the sweep waiting on their pipes
+        self._run_failing_sweep(use_subprocess=True)
+
+    @unittest.skipUnless(hasattr(__import__('os'), 'fork'), 'in-process calls need fork')
+    def test_failing_value_stops_in_process_sweep(self):
+        # The same sweep with three concurrent forked calls
+        self._run_failing_sweep(use_subprocess=False)
+
+if __name__ == '__main__':
+    unittest.main()